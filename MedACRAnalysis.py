@@ -1,4 +1,4 @@
-from hazenlib.utils import get_dicom_files
+from hazenlib.utils import get_series_index
 from hazenlib.tasks.acr_snr import ACRSNR
 from hazenlib.tasks.acr_uniformity import ACRUniformity
 from hazenlib.tasks.acr_geometric_accuracy import ACRGeometricAccuracy
@@ -7,7 +7,6 @@ from hazenlib.tasks.acr_ghosting import ACRGhosting
 from hazenlib.tasks.acr_slice_position import ACRSlicePosition
 from hazenlib.tasks.acr_slice_thickness import ACRSliceThickness
 from hazenlib.ACRObject import ACRObject
-import pydicom
 from datetime import date
 from hazenlib.logger import logger
 import warnings
@@ -17,8 +16,17 @@ import os
 ReportText = ""
 ManualResTestText=None
 
+#Sorts the DICOM files into {SeriesDescription: [files]}. If the caller has already done this (eg the GUI when the DICOM path was set) it can be passed in as preparsed to skip reading the headers again.
+def GetSeriesFiles(DICOMPath,preparsed=None):
+    if preparsed is not None:
+        return preparsed
+    ACRDICOMSFiles = {}
+    for file, desc in get_series_index(DICOMPath).items():
+        ACRDICOMSFiles.setdefault(desc,[]).append(file)
+    return ACRDICOMSFiles
+
 #This is a file which simply contains a function to run the analysis. It is in a seperate file so i can reuse it for the various implementations.
-def RunAnalysis(Seq,DICOMPath,OutputPath,RunAll=True, RunSNR=False, RunGeoAcc=False, RunSpatialRes=False, RunUniformity=False, RunGhosting=False, RunSlicePos=False, RunSliceThickness=False):
+def RunAnalysis(Seq,DICOMPath,OutputPath,RunAll=True, RunSNR=False, RunGeoAcc=False, RunSpatialRes=False, RunUniformity=False, RunGhosting=False, RunSlicePos=False, RunSliceThickness=False, preparsed=None):
     global ReportText
     
     if RunAll == True:
@@ -43,14 +51,7 @@ def RunAnalysis(Seq,DICOMPath,OutputPath,RunAll=True, RunSNR=False, RunGeoAcc=Fa
     #load in the DICOM
     #DICOMPath="DataTransfer"
 
-    files = get_dicom_files(DICOMPath)
-    ACRDICOMSFiles = {}
-    for file in files:
-        data = pydicom.dcmread(file)
-        if (data.SeriesDescription not in ACRDICOMSFiles.keys()):
-            ACRDICOMSFiles[data.SeriesDescription]=[]
-        ACRDICOMSFiles[data.SeriesDescription].append(file)
-    Data = ACRDICOMSFiles[Seq]
+    Data = GetSeriesFiles(DICOMPath,preparsed)[Seq]
 
     ToleranceTable = {}
     ToleranceTable["SNR"]=[None,None]
@@ -265,14 +266,7 @@ def RunAnalysis(Seq,DICOMPath,OutputPath,RunAll=True, RunSNR=False, RunGeoAcc=Fa
 
 
 #This could be done better by making the whole thing a class, that way it only needs loaded in once. 
-def GetROIFigs(Seq,DICOMPath):
-    files = get_dicom_files(DICOMPath)
-    ACRDICOMSFiles = {}
-    for file in files:
-        data = pydicom.dcmread(file)
-        if (data.SeriesDescription not in ACRDICOMSFiles.keys()):
-            ACRDICOMSFiles[data.SeriesDescription]=[]
-        ACRDICOMSFiles[data.SeriesDescription].append(file)
-    Data = ACRDICOMSFiles[Seq]
+def GetROIFigs(Seq,DICOMPath,preparsed=None):
+    Data = GetSeriesFiles(DICOMPath,preparsed)[Seq]
     acr_spatial_resolution_task = ACRSpatialResolution(input_data=Data,MediumACRPhantom=True)
     return acr_spatial_resolution_task.GetROICrops()
\ No newline at end of file
@@ -2,8 +2,7 @@ import sys
 sys.path.insert(0,"C:\\Users\\Johnt\\Documents\\GitHub\\Hazen-ScottishACR-Fork")
 sys.path.insert(0,"D:\\Hazen-ScottishACR-Fork")
 sys.path.insert(0,".\\app")
-import pydicom
-from hazenlib.utils import get_dicom_files
+from hazenlib.utils import get_series_index
 from hazenlib.tasks.acr_snr import ACRSNR
 from hazenlib.tasks.acr_uniformity import ACRUniformity
 from hazenlib.tasks.acr_geometric_accuracy import ACRGeometricAccuracy
@@ -13,56 +12,50 @@ from hazenlib.tasks.acr_slice_position import ACRSlicePosition
 from hazenlib.tasks.acr_slice_thickness import ACRSliceThickness
 from hazenlib.ACRObject import ACRObject
 import pathlib
+import gc
+from concurrent.futures import ProcessPoolExecutor
 from tests import TEST_DATA_DIR, TEST_REPORT_DIR
 
 ReportDirPath = "MedACRTesting/Results"
 
-files = get_dicom_files("MedACRTesting/ACR_Phantom_Data")
-ACRDICOMSFiles = {}
-for file in files:
-    data = pydicom.dcmread(file)
-    if (data.SeriesDescription not in ACRDICOMSFiles.keys()):
-        ACRDICOMSFiles[data.SeriesDescription]=[]
-    ACRDICOMSFiles[data.SeriesDescription].append(file)
-DCMData={}
-DCMData["ACR AxT1"] = ACRDICOMSFiles["ACR AxT1"]
-DCMData["ACR AxT2"] = ACRDICOMSFiles["ACR AxT2"]
-
-files = get_dicom_files("MedACRTesting/ACR_ARDL_Tests")
-ACR_DICOM_ARDL_Files = {}
-for file in files:
-    data = pydicom.dcmread(file)
-    if (data.SeriesDescription not in ACR_DICOM_ARDL_Files.keys()):
-        ACR_DICOM_ARDL_Files[data.SeriesDescription]=[]
-    ACR_DICOM_ARDL_Files[data.SeriesDescription].append(file)
-DCM_ARDL_Data={}
-#DCM_ARDL_Data["ACR AxT1"] = ACR_DICOM_ARDL_Files["ACR AxT1"]
-#DCM_ARDL_Data["ACR AxT1 Low SNR"] = ACR_DICOM_ARDL_Files["ACR AxT1 Low SNR"]
-DCM_ARDL_Data["ACR AxT1 High AR"] = ACR_DICOM_ARDL_Files["ACR AxT1 High AR"]
-
 #Looks like its working fine
 #Not sure how to verify this because its the smooth subtraction method...
 def RunSNR(Data):
-    for seq in Data.keys():
-        acr_snr_task = ACRSNR(input_data=Data[seq], report_dir=ReportDirPath,report=True,MediumACRPhantom=True)
-        snr = acr_snr_task.run()
-        print(seq+" SNR :" +str(snr["measurement"]["snr by smoothing"]["measured"]))
+    for seq, files in Data.items():
+        acr_snr_task = ACRSNR(input_data=files, report_dir=ReportDirPath,report=True,MediumACRPhantom=True)
+        try:
+            snr = acr_snr_task.run()
+            print(seq+" SNR :" +str(snr["measurement"]["snr by smoothing"]["measured"]))
+        finally:
+            #Drop the task (and the pixel data it holds) before loading the next sequence
+            del acr_snr_task
+            gc.collect()
 
 
 
 def GeoAcc(Data):
-    for seq in Data.keys():
-        acr_geometric_accuracy_task = ACRGeometricAccuracy(input_data=Data[seq],report_dir=ReportDirPath,MediumACRPhantom=True,report=True)
-        GeoDist = acr_geometric_accuracy_task.run()
-        print(seq+" Slice 1 Hor Dist: "+str(GeoDist["measurement"][GeoDist["file"][0]]["Horizontal distance"]) + "   "+ " Vert Dist: "+str(GeoDist["measurement"][GeoDist["file"][0]]["Vertical distance"]))
-        print(seq+" Slice 5 Hor Dist:"+str(GeoDist["measurement"][GeoDist["file"][1]]["Horizontal distance"]) + "   "+ " Vert Dist:"+str(GeoDist["measurement"][GeoDist["file"][1]]["Vertical distance"])+ "   "+ " Diag SW Dist:"+str(GeoDist["measurement"][GeoDist["file"][1]]["Diagonal distance SW"])+ "   "+ "Diag SE Dist:"+str(GeoDist["measurement"][GeoDist["file"][1]]["Diagonal distance SE"]))
+    for seq, files in Data.items():
+        acr_geometric_accuracy_task = ACRGeometricAccuracy(input_data=files,report_dir=ReportDirPath,MediumACRPhantom=True,report=True)
+        try:
+            GeoDist = acr_geometric_accuracy_task.run()
+            print(seq+" Slice 1 Hor Dist: "+str(GeoDist["measurement"][GeoDist["file"][0]]["Horizontal distance"]) + "   "+ " Vert Dist: "+str(GeoDist["measurement"][GeoDist["file"][0]]["Vertical distance"]))
+            print(seq+" Slice 5 Hor Dist:"+str(GeoDist["measurement"][GeoDist["file"][1]]["Horizontal distance"]) + "   "+ " Vert Dist:"+str(GeoDist["measurement"][GeoDist["file"][1]]["Vertical distance"])+ "   "+ " Diag SW Dist:"+str(GeoDist["measurement"][GeoDist["file"][1]]["Diagonal distance SW"])+ "   "+ "Diag SE Dist:"+str(GeoDist["measurement"][GeoDist["file"][1]]["Diagonal distance SE"]))
+        finally:
+            #Drop the task (and the pixel data it holds) before loading the next sequence
+            del acr_geometric_accuracy_task
+            gc.collect()
 
 #seems to be working but i will keep an eye on it...
 def SpatialRes(Data):
-    for seq in Data.keys():
-        acr_spatial_resolution_task = ACRSpatialResolution(input_data=Data[seq],report_dir=ReportDirPath,report=True,MediumACRPhantom=True)
-        Res = acr_spatial_resolution_task.run()
-        print(seq+" MTF Raw :" +str(Res["measurement"]["raw mtf50"]) + "     MTF Fitted :" + str(Res["measurement"]["fitted mtf50"]))
+    for seq, files in Data.items():
+        acr_spatial_resolution_task = ACRSpatialResolution(input_data=files,report_dir=ReportDirPath,report=True,MediumACRPhantom=True)
+        try:
+            Res = acr_spatial_resolution_task.run()
+            print(seq+" MTF Raw :" +str(Res["measurement"]["raw mtf50"]) + "     MTF Fitted :" + str(Res["measurement"]["fitted mtf50"]))
+        finally:
+            #Drop the task (and the pixel data it holds) before loading the next sequence
+            del acr_spatial_resolution_task
+            gc.collect()
 
 def SpatialResUsingDotMatrix(Data):
     for seq in Data.keys():
@@ -98,4 +91,33 @@ def SliceThickness(Data):
         SliceThick = acr_slice_thickness_task.run()
         print(seq + "Slice Width (mm): " + str(SliceThick['measurement']['slice width mm']))
 
-SpatialResUsingDotMatrix(DCM_ARDL_Data)
\ No newline at end of file
+#SNR, geometric accuracy and spatial res share nothing so they can run side by side in their own processes.
+#Each task class already writes its report into its own subfolder of ReportDirPath so the workers dont clash.
+def RunTask(args):
+    Name, Data = args
+    {"snr": RunSNR, "geo": GeoAcc, "res": SpatialRes}[Name](Data)
+
+def RunTasksInParallel(Data):
+    with ProcessPoolExecutor(max_workers=3) as ex:
+        list(ex.map(RunTask, [("snr",Data),("geo",Data),("res",Data)]))
+
+#Guarded so the worker processes dont rescan the data folders (and race on the series index cache) or rerun the analysis when they import this file
+if __name__ == "__main__":
+    #Series descriptions are cached on disk so re-runs dont rescan every header
+    ACRDICOMSFiles = {}
+    for file, desc in get_series_index("MedACRTesting/ACR_Phantom_Data").items():
+        ACRDICOMSFiles.setdefault(desc,[]).append(file)
+    DCMData={}
+    DCMData["ACR AxT1"] = ACRDICOMSFiles["ACR AxT1"]
+    DCMData["ACR AxT2"] = ACRDICOMSFiles["ACR AxT2"]
+
+    ACR_DICOM_ARDL_Files = {}
+    for file, desc in get_series_index("MedACRTesting/ACR_ARDL_Tests").items():
+        ACR_DICOM_ARDL_Files.setdefault(desc,[]).append(file)
+    DCM_ARDL_Data={}
+    #DCM_ARDL_Data["ACR AxT1"] = ACR_DICOM_ARDL_Files["ACR AxT1"]
+    #DCM_ARDL_Data["ACR AxT1 Low SNR"] = ACR_DICOM_ARDL_Files["ACR AxT1 Low SNR"]
+    DCM_ARDL_Data["ACR AxT1 High AR"] = ACR_DICOM_ARDL_Files["ACR AxT1 High AR"]
+
+    #RunTasksInParallel(DCMData)
+    SpatialResUsingDotMatrix(DCM_ARDL_Data)
\ No newline at end of file
@@ -6,8 +6,6 @@ from tkinter import StringVar
 from tkinter import IntVar
 import sys
 sys.path.append(".")
-from hazenlib.utils import get_dicom_files
-import pydicom
 from tkinter import DISABLED, NORMAL, N, S, E, W, LEFT, RIGHT, TOP, BOTTOM, messagebox, END, NW
 import MedACRAnalysis
 import os 
@@ -15,21 +13,66 @@ import HighlightText
 import glob 
 import subprocess
 import platform
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import (FigureCanvasTkAgg,NavigationToolbar2Tk) 
+import collections
+import itertools
+import re
+import time
+import numpy as np
+from PIL import Image, ImageTk
 from hazenlib.tasks.acr_spatial_resolution import ACRSpatialResolution
 
 class TextRedirector(object):
+    #Writes are buffered and pushed to the widget in one go, redrawing Tk on every print is very slow
+    FlushDelayMs = 30
+    #stdout and stderr write to the same widget, so they share one buffer per widget to keep the text in the order it was written
+    _Buffers = {}
+
     def __init__(self, widget, tag="stdout"):
         self.widget = widget
         self.tag = tag
+        self._state = TextRedirector._Buffers.setdefault(
+            widget, {"buf": collections.deque(), "pending": False, "lastFlush": time.monotonic()}
+        )
+        #Keep the widget editable and stop the user typing in it with bindings, so writing doesnt need to toggle its state
+        self.widget.configure(state="normal")
+        self.widget.bind("<Key>", self._blockEdits)
+        #Middle click pastes the X selection through <<PasteSelection>>, so block that as well as the clipboard events
+        for event in ("<<Paste>>", "<<Cut>>", "<<Clear>>", "<<PasteSelection>>", "<Button-2>", "<ButtonRelease-2>"):
+            self.widget.bind(event, lambda e: "break")
+
+    def _blockEdits(self, event):
+        #Still allow copying and selecting all
+        if event.state & 0x4 and event.keysym.lower() in ("c", "a"):
+            return None
+        return "break"
 
     def write(self, string):
-        self.widget.configure(state="normal")
-        self.widget.insert("end", string, (self.tag,))
-        self.widget.configure(state="disabled")
+        state = self._state
+        state["buf"].append((string, self.tag))
+        #The analysis runs on the main thread so the after callback wont fire until its done, flush now and again so progress is still shown
+        if time.monotonic() - state["lastFlush"] > self.FlushDelayMs/1000:
+            self._flush()
+            self.widget.update_idletasks()
+        elif not state["pending"]:
+            state["pending"] = True
+            self.widget.after(self.FlushDelayMs, self._flush)
+
+    def flush(self):
+        pass
+
+    def _flush(self):
+        state = self._state
+        state["pending"] = False
+        state["lastFlush"] = time.monotonic()
+        if not state["buf"]:
+            return
+        #Join consecutive writes with the same tag and insert all the runs in one call, in write order
+        args = []
+        for tag, writes in itertools.groupby(state["buf"], key=lambda w: w[1]):
+            args += ["".join(string for string, _ in writes), (tag,)]
+        state["buf"].clear()
+        self.widget.insert("end", *args)
         self.widget.see("end")
-        root.update()
         
 root = tkinter.Tk()
 sv_ttk.set_theme("dark")
@@ -38,6 +81,9 @@ root.title('Medium ACR Phantom QA Analysis')
 root.iconbitmap("_internal\ct-scan.ico")
 
 
+#Localiser series are not analysed so are left out of the sequence dropdown
+LocaliserRegex = re.compile("loc", re.IGNORECASE)
+
 def SetDCMPath():
     dropdownResults.config(state="disabled")
     ViewResultsBtn.config(state="disabled")
@@ -52,19 +98,16 @@ def SetDCMPath():
     DCMfolder_path.set(filename)
     InitalDirDICOM=DCMfolder_path.get()
 
-    options=[]
-    files = get_dicom_files(DCMfolder_path.get())
-    sequences = []
-    for file in files:
-        data = pydicom.dcmread(file)
-        if "Loc" not in data.SeriesDescription and "loc" not in data.SeriesDescription:
-            options.append(data.SeriesDescription)
-
-    
-    options= list(set(options))
-    options.sort()
-    options.append(options[0])
-    dropdown.set_menu(*options)
+    #Cached on disk so reopening the same folder doesnt rescan every header
+    global SeriesFiles
+    SeriesFiles = MedACRAnalysis.GetSeriesFiles(DCMfolder_path.get())
+    options = sorted({desc for desc in SeriesFiles if not LocaliserRegex.search(desc)})
+    if not options:
+        messagebox.showerror("Error", "No sequences found in the DICOM Path")
+        return
+    #set_menu takes the default first then the items, so the default isnt added to the list twice
+    selected_option.set(options[0])
+    dropdown.set_menu(options[0], *options)
     dropdown.config(state="normal")
 
 
@@ -98,17 +141,84 @@ def EnableOrDisableEverything(Enable):
         for widgets in WidgetsToToggle:
             widgets.config(state="disabled")
 
-def ImageResolvable(newwindow):
+def ImageResolvable():
     global CurrentROI
     global ROI_Results_ResResults
     ROI_Results_ResResults[CurrentROI] = True
-    newwindow.destroy()
+    ShowNextROI()
 
-def ImageNotResolvable(newwindow):
+def ImageNotResolvable():
     global CurrentROI
     global ROI_Results_ResResults
     ROI_Results_ResResults[CurrentROI] = False
-    newwindow.destroy()
+    ShowNextROI()
+
+#The manual resolution check is driven by the Yes/No callbacks, each answer moves on to the next ROI in the
+#same window so there is no nested event loop. OnDone is called once every ROI has been answered.
+def StartManualResCheck(ROIS, OnDone):
+    global ROIIterator, ROIWindow, ROIsDone
+    ROIIterator = iter(ROIS.items())
+    ROIsDone = OnDone
+
+    ROIWindow =  tkinter.Toplevel(root)
+    ROIWindow.iconbitmap("_internal\ct-scan.ico")
+    ROIWindow.geometry("500x540")
+    ROIWindow.configure(background='white')
+    ROIWindow.Title_label = ttk.Label(ROIWindow, background="white", foreground="black")
+    ROIWindow.Title_label.pack(side=TOP)
+    ROIWindow.Image_label = ttk.Label(ROIWindow, background="white")
+    ROIWindow.Image_label.pack(side=TOP)
+
+    Pattern_label = ttk.Label(ROIWindow, text="Is the Above Pattern Resolvable? (Y/N)", background="white", foreground="black")
+    Pattern_label.place(relx=0.5, rely=0.85,anchor="center")
+
+    Yes_button = ttk.Button(ROIWindow, text="Yes",width=3, command=ImageResolvable)
+    Yes_button.place(relx=0.45, rely=0.89, anchor="center")
+
+    No_button = ttk.Button(ROIWindow, text="No",width=3, command=ImageNotResolvable)
+    No_button.place(relx=0.55, rely=0.89, anchor="center")
+
+    ROIWindow.bind("<y>", lambda e: ImageResolvable())
+    ROIWindow.bind("<n>", lambda e: ImageNotResolvable())
+    #Closing the window finishes the check early, the current and remaining patterns are left unanswered (None) and reported as Not Resolved
+    ROIWindow.protocol("WM_DELETE_WINDOW", FinishManualResCheck)
+    ROIWindow.focus_set()
+    ShowNextROI()
+
+def ShowNextROI():
+    global CurrentROI
+    global ROI_Results_ResResults
+    try:
+        key, roi = next(ROIIterator)
+    except StopIteration:
+        FinishManualResCheck()
+        return
+    ROI_Results_ResResults[key]=None
+    CurrentROI=key
+    print ("Displaying Res Pattern: " +key)
+    ROIWindow.Title_label.config(text=key)
+    tkimg = ROIToPhotoImage(roi, 420)
+    ROIWindow.Image_label.config(image=tkimg)
+    ROIWindow.Image_label.image = tkimg #Keep a reference or Tk shows a blank image
+
+def FinishManualResCheck():
+    #Record any patterns not shown yet (the window was closed early) as unanswered so the report still lists every pattern
+    for key, roi in ROIIterator:
+        ROI_Results_ResResults[key] = None
+    ROIWindow.destroy()
+    MedACRAnalysis.ManualResTestText = ROI_Results_ResResults
+    ROIsDone()
+
+def ROIToPhotoImage(arr, size):
+    #Displaying a small 2D array doesnt need matplotlib, scale it to 8 bit and let PIL hand it to Tk
+    arr = np.asarray(arr, dtype=float)
+    arr = arr - arr.min()
+    if arr.max() > 0:
+        arr = arr * (255.0 / arr.max())
+    img = Image.fromarray(arr.astype(np.uint8))
+    scale = max(1, size // max(img.size))
+    img = img.resize((img.size[0]*scale, img.size[1]*scale), Image.NEAREST)
+    return ImageTk.PhotoImage(img)
 
 def RunAnalysis():
     global CurrentROI
@@ -146,72 +256,51 @@ def RunAnalysis():
         messagebox.showerror("Error", "No Results Path Set")
     EnableOrDisableEverything(False)
 
+    Tests = dict(RunAll=RunAll, RunSNR=SNR, RunGeoAcc=GeoAcc, RunSpatialRes=SpatialRes, RunUniformity=Uniformity, RunGhosting=Ghosting, RunSlicePos=SlicePos, RunSliceThickness=SliceThickness)
     if ManualResCheck.get()==1:
-        ROIS = MedACRAnalysis.GetROIFigs(selected_option.get(),DCMfolder_path.get())
-        plt.close('all')#Making sure no rogue plots are sitting in the background...
-        
-        for key in ROIS:
-            ROI_Results_ResResults[key]=None
-            CurrentROI=key
-            print ("Displaying Res Pattern: " +key)
-            newWindow =  tkinter.Toplevel(root)
-            newWindow.iconbitmap("_internal\ct-scan.ico")
-            newWindow.geometry("500x540")
-            newWindow.configure(background='white')
-            plt.title(key)
-            plt.imshow(ROIS[key])
-            canvas = FigureCanvasTkAgg(plt.gcf(), master = newWindow)   
-            canvas.draw() 
-            canvas.get_tk_widget().pack(side=TOP)
-            toolbar = NavigationToolbar2Tk(canvas, newWindow) 
-            toolbar.update() 
-            canvas.get_tk_widget().pack() 
-
-            Pattern_label = ttk.Label(newWindow, text="Is the Above Pattern Resolvable?", background="white", foreground="black")
-            Pattern_label.place(relx=0.5, rely=0.85,anchor="center")
-
-            Yes_button = ttk.Button(newWindow, text="Yes",width=3, command =lambda: ImageResolvable(newWindow))
-            Yes_button.place(relx=0.45, rely=0.89, anchor="center")
-
-            No_button = ttk.Button(newWindow, text="No",width=3, command = lambda: ImageNotResolvable(newWindow))
-            No_button.place(relx=0.55, rely=0.89, anchor="center")
-
-            root.wait_window(newWindow)
-            plt.close()
-        MedACRAnalysis.ManualResTestText = ROI_Results_ResResults
-    MedACRAnalysis.RunAnalysis(selected_option.get(),DCMfolder_path.get(),Resultsfolder_path.get(),RunAll=RunAll, RunSNR=SNR, RunGeoAcc=GeoAcc, RunSpatialRes=SpatialRes, RunUniformity=Uniformity, RunGhosting=Ghosting, RunSlicePos=SlicePos, RunSliceThickness=SliceThickness)
+        ROIS = MedACRAnalysis.GetROIFigs(selected_option.get(),DCMfolder_path.get(),preparsed=SeriesFiles)
+        StartManualResCheck(ROIS, lambda: FinishAnalysis(Tests))
+    else:
+        FinishAnalysis(Tests)
+
+def FinishAnalysis(Tests):
+    MedACRAnalysis.RunAnalysis(selected_option.get(),DCMfolder_path.get(),Resultsfolder_path.get(),preparsed=SeriesFiles,**Tests)
     EnableOrDisableEverything(True)
 
     textResults.configure(state="normal")
     textResults.delete(1.0, END)
-    textResults.insert("end", MedACRAnalysis.ReportText)
     textResults.tag_config("Pass", foreground="green")
     textResults.tag_config("Fail", foreground="red")
     textResults.tag_config("No Tolerance Set", foreground="yellow")
-    textResults.highlight_pattern(r"Pass","Pass")
-    textResults.highlight_pattern(r"Fail","Fail")
-    textResults.highlight_pattern(r"No Tolerance Set","No Tolerance Set")
+    textResults.insert_highlighted(MedACRAnalysis.ReportText, ["Pass", "Fail", "No Tolerance Set"])
     textResults.configure(state="disabled")
 
-    #Find all folders
-    Folders = [x[0] for x in os.walk(Resultsfolder_path.get())]
-    Indexofroot = Folders.index(Resultsfolder_path.get())
-    del Folders[Indexofroot]
+    #Find all folders, each task writes its images into its own folder directly under the results path
+    with os.scandir(Resultsfolder_path.get()) as it:
+        Folders = [e.path for e in it if e.is_dir()]
     DropDownOptions = []
     for folder in Folders:
         DropDownOptions.append(folder.split(os.sep)[-1])
     
+    #Record the result images now so viewing a result doesnt need to search the disk again
+    ResultPNGs.clear()
+    for folder in Folders:
+        with os.scandir(folder) as it:
+            ResultPNGs[folder.split(os.sep)[-1]] = [e.path for e in it if e.name.endswith(".png")]
+    
     DropDownOptions.sort()
-    DropDownOptions.append(DropDownOptions[0])
-    dropdownResults.set_menu(*DropDownOptions)
+    if DropDownOptions:
+        Result_Selection.set(DropDownOptions[0])
+        dropdownResults.set_menu(DropDownOptions[0], *DropDownOptions)
     dropdownResults.config(state="normal")
     print ("Done")
 
 def ViewResult():
     ChosenResult = Result_Selection.get()
-    Path = Resultsfolder_path.get()
-    ChosenFolder = os.path.join(ChosenResult, Path)
-    Files = glob.glob(os.path.join(ChosenFolder,ChosenResult,"*.png"))
+    if ChosenResult in ResultPNGs:
+        Files = ResultPNGs[ChosenResult]
+    else:
+        Files = glob.glob(os.path.join(Resultsfolder_path.get(),ChosenResult,"*.png"))
     UnderScrolledSeq = selected_option.get().replace(' ','_')
 
     FilesToOpen = []
@@ -228,6 +317,11 @@ InitalDirDICOM=None
 InitalDirOutput=None
 CurrentROI=None
 ROI_Results_ResResults = {}
+ROIIterator=None
+ROIWindow=None
+ROIsDone=None
+SeriesFiles=None
+ResultPNGs = {}
 
 PathFrame = ttk.Frame(root)
 DCMPathButton = ttk.Button(text="Set DICOM Path", command=SetDCMPath,width=22)
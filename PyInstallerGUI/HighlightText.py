@@ -11,6 +11,7 @@ class CustomText(tk.Text):
     highlight_pattern(pattern, tag) - Cleans all highlights and highlights all matches of the pattern.
     clean_highlights(tag) - Removes all highlights of the given tag.
     search_re(pattern) - Uses the python re library to match patterns.
+    insert_highlighted(text, tags) - Inserts text, tagging matches as it goes.
     """
     def __init__(self, master, *args, **kwargs):
         super().__init__(master, *args, **kwargs)
@@ -56,4 +57,21 @@ class CustomText(tk.Text):
             tag - The tag to use for the highlights.
         """
         self.clean_highlights(tag)
-        self.highlight_all(pattern, tag)
\ No newline at end of file
+        self.highlight_all(pattern, tag)
+
+    def insert_highlighted(self, text, tags):
+        """
+        Inserts text at the end of the widget, tagging every match in a single pass
+        rather than searching the widget again for each pattern.
+
+        Arguments:
+            text - The text to insert.
+            tags - List of tag names, each tag name is also the literal text it highlights.
+        """
+        pattern = re.compile("|".join(re.escape(tag) for tag in tags))
+        pos = 0
+        for match in pattern.finditer(text):
+            self.insert(tk.END, text[pos:match.start()])
+            self.insert(tk.END, match.group(), match.group())
+            pos = match.end()
+        self.insert(tk.END, text[pos:])
@@ -1,12 +1,61 @@
+import functools
 import cv2
 import scipy
 import skimage
 import numpy as np
 from pydicom import dcmread
 import sys
-import matplotlib.pyplot as plt 
 from hazenlib.utils import get_image_orientation
 
+
+@functools.lru_cache(maxsize=32)
+def _circular_mask(centre, radius, dims):
+    # Define a circular logical mask
+
+    #BugFix, should this not start at 0?
+    # x runs along the columns and y down the rows; broadcasting them
+    # avoids building full-size coordinate grids
+    x = np.arange(dims[0], dtype=np.float64)[np.newaxis, :]
+    y = np.arange(dims[1], dtype=np.float64)[:, np.newaxis]
+
+    mask = (x - centre[0]) ** 2 + (y - centre[1]) ** 2 <= radius**2
+    mask.setflags(write=False)
+
+    return mask
+
+
+# midpoints of the four pixel edges, in half-pixel units (x, y)
+_PIXEL_EDGE_OFFSETS = np.array([[-1, 0], [1, 0], [0, -1], [0, 1]], np.int32)
+
+
+def _convex_hull_mask(mask):
+    # Same mask as skimage.morphology.convex_hull_image, with the hull found
+    # by OpenCV. As in skimage, each pixel contributes the midpoints of its
+    # edges to the hull and pixel centres on the hull boundary are included.
+    final_mask = np.zeros(mask.shape, np.uint8)
+    points = cv2.findNonZero(mask.astype(np.uint8))
+    if points is None:
+        return final_mask.astype(bool)
+    hull = cv2.convexHull(points)[:, 0, :]
+    hull = cv2.convexHull(
+        (2 * hull[:, np.newaxis, :] + _PIXEL_EDGE_OFFSETS).reshape(-1, 2)
+    )
+
+    # rasterising the hull is only accurate to about a pixel, so pixels close
+    # to its boundary are tested exactly against the hull polygon
+    cv2.fillConvexPoly(final_mask, hull, 1, shift=1)
+    kernel = np.ones((5, 5), np.uint8)
+    inside = cv2.erode(
+        final_mask, kernel, borderType=cv2.BORDER_CONSTANT, borderValue=0
+    ).astype(bool)
+    boundary = cv2.dilate(final_mask, kernel).astype(bool) & ~inside
+    inside[boundary] = skimage.measure.points_in_poly(
+        np.argwhere(boundary), hull[:, 0, ::-1] / 2
+    )
+
+    return inside
+
+
 class ACRObject:
     def __init__(self, dcm_list,kwargs={}):
         
@@ -270,20 +319,31 @@ class ACRObject:
             initial_mask = skimage.filters.threshold_sauvola(
                 image, window_size=3, k=0.95
             )
+            opened_mask = skimage.morphology.area_opening(
+                initial_mask, area_threshold=open_threshold
+            )
         else:
             initial_mask = image > mag_threshold * np.max(image)
-
-        opened_mask = skimage.morphology.area_opening(
-            initial_mask, area_threshold=open_threshold
-        )
-        final_mask = skimage.morphology.convex_hull_image(opened_mask)
+            # for a binary mask an area opening only removes the connected
+            # components smaller than the threshold, so filter the components
+            # by area directly (4-connected, as area_opening)
+            _, labels, stats, _ = cv2.connectedComponentsWithStats(
+                initial_mask.astype(np.uint8), connectivity=4
+            )
+            keep = stats[:, cv2.CC_STAT_AREA] >= open_threshold
+            keep[0] = False
+            opened_mask = keep[labels]
+        final_mask = _convex_hull_mask(opened_mask != 0)
 
         return final_mask
 
     @staticmethod
     def circular_mask(centre, radius, dims):
         """
-        Sort a stack of images based on slice position.
+        Create a circular logical mask.
+
+        Masks are cached by centre, radius and dimensions, as the same ROIs are
+        used for every image of a phantom. The returned mask is read-only.
 
         Parameters
         ----------
@@ -296,21 +356,10 @@ class ACRObject:
 
         Returns
         -------
-        img_stack : np.array
-            A sorted stack of images, where each image is represented as a 2D numpy array.
+        mask : np.array
+            A boolean array, True inside the circle.
         """
-        # Define a circular logical mask
-
-        #BugFix, should this not start at 0?
-        x = np.linspace(0, dims[0]-1, dims[0])
-        y = np.linspace(0, dims[1]-1, dims[1])
-
-
-
-        X, Y = np.meshgrid(x, y)
-        mask = (X - centre[0]) ** 2 + (Y - centre[1]) ** 2 <= radius**2
-
-        return mask
+        return _circular_mask(tuple(centre), radius, tuple(dims))
 
     def measure_orthogonal_lengths(self, mask):
         """
@@ -3,6 +3,8 @@ HazenTask.py
 """
 import os
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pydicom import dcmread
 
 from hazenlib.logger import logger
@@ -13,7 +15,12 @@ class HazenTask:
         self, input_data: list, report: bool = False, report_dir=None, **kwargs
     ):
         data_paths = sorted(input_data)
-        self.dcm_list = [dcmread(dicom) for dicom in data_paths]
+        # large elements (i.e. PixelData) are only read from disk when first accessed.
+        # Reading is I/O bound so the files are read in threads
+        with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as ex:
+            self.dcm_list = list(
+                ex.map(partial(dcmread, defer_size="1 KB"), data_paths)
+            )
         self.report: bool = report
         if report_dir is not None:
             self.report_path = os.path.join(str(report_dir), type(self).__name__)
@@ -27,6 +34,11 @@ class HazenTask:
             pass
         self.report_files = []
 
+    def save_report_fig(self, fig, img_path):
+        # report images are written at a low dpi and PNG compression level 1,
+        # which is much quicker to write than the default level 6 for a slightly bigger file
+        fig.savefig(img_path, dpi=72, pil_kwargs={"compress_level": 1})
+
     def init_result_dict(self) -> dict:
         result_dict = {
             "task": f"{type(self).__name__}",
@@ -1,9 +1,52 @@
+import os
 import sys
 import logging
+import logging.handlers
+import multiprocessing
 import colorlog
 
+LOG_FILE = "Hazen_logger.log"
+
+# plain formatter shared by the log file and the GUI log window
+plain_formatter = logging.Formatter(
+    "%(asctime)-15s %(levelname).1s [%(filename)s:%(funcName)s:%(lineno)d]"
+    " %(message)s",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+
+def make_file_handler():
+    # delay=True so the log file is not opened until something is logged
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=10_000_000, backupCount=3, delay=True
+    )
+    file_handler.setFormatter(plain_formatter)
+    return file_handler
+
+
+def is_main_process():
+    # RotatingFileHandler is not safe with several processes writing to the same
+    # file (rollover fails on Windows), so only the main process logs to file and
+    # process pool workers just log to the console
+    return multiprocessing.current_process().name == "MainProcess"
+
+
+def has_file_handler():
+    return any(isinstance(h, logging.FileHandler) for h in logger.handlers)
+
+
+def remove_file_handlers():
+    # forked workers inherit the parent's handlers, drop the file ones
+    for handler in logger.handlers[:]:
+        if isinstance(handler, logging.FileHandler):
+            logger.removeHandler(handler)
+
 
 def configure_logger():
+    # handlers are only added once, otherwise every log line is duplicated
+    if logger.handlers:
+        return
+
     # make log formatters
     stream_formatter = colorlog.ColoredFormatter(
         "%(log_color)s%(asctime)-15s %(levelname).1s "
@@ -11,52 +54,30 @@ def configure_logger():
         "%Y-%m-%d %H:%M:%S",
     )
 
-    file_formatter = logging.Formatter(
-        "%(asctime)-15s %(levelname).1s [%(filename)s:%(funcName)s:%(lineno)d]"
-        " %(message)s",
-        "%Y-%m-%d %H:%M:%S",
-    )
-
-    log_file = "Hazen_logger.log"
     stream_handler = logging.StreamHandler(sys.stdout)
-    file_handler = logging.FileHandler(log_file)
-
-    # set formatters
     stream_handler.setFormatter(stream_formatter)
-    file_handler.setFormatter(file_formatter)
 
     # add handlers
     logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
+    if is_main_process():
+        logger.addHandler(make_file_handler())
 
 
 def ConfigureLoggerForGUI():
-    # make log formatters, removing colour for GUI or it shows some missing chars
-    stream_formatter = logging.Formatter(
-        "%(asctime)-15s %(levelname).1s [%(filename)s:%(funcName)s:%(lineno)d]"
-        " %(message)s",
-        "%Y-%m-%d %H:%M:%S",
-    )
-
-    file_formatter = logging.Formatter(
-        "%(asctime)-15s %(levelname).1s [%(filename)s:%(funcName)s:%(lineno)d]"
-        " %(message)s",
-        "%Y-%m-%d %H:%M:%S",
-    )
+    # swap the console handler for one without colour (or it shows some missing chars in the GUI)
+    # which writes to the current, redirected, stdout. The file handler is kept as is.
+    for handler in logger.handlers[:]:
+        if type(handler) is logging.StreamHandler:
+            logger.removeHandler(handler)
 
-    log_file = "Hazen_logger.log"
     stream_handler = logging.StreamHandler(sys.stdout)
-    file_handler = logging.FileHandler(log_file)
-
-    # set formatters
-    stream_handler.setFormatter(stream_formatter)
-    file_handler.setFormatter(file_formatter)
-
-    # add handlers
+    stream_handler.setFormatter(plain_formatter)
     logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
+
+    if is_main_process() and not has_file_handler():
+        logger.addHandler(make_file_handler())
 
 logger = logging.getLogger(__name__)
 configure_logger()
-
-
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=remove_file_handlers)
@@ -226,8 +226,10 @@ TEMPLATE_VALUES = {
 
 SMOOTH_TIMES = {"t1": range(0, 1000, 10), "t2": range(0, 500, 5)}
 
-TEMPLATE_FIT_ITERS = 500
-TERMINATION_EPS = 1e-10
+# ECC converges quickly near the optimum, the last few decimal places of the
+# correlation coefficient make no difference to the ROI positions
+TEMPLATE_FIT_ITERS = 200
+TERMINATION_EPS = 1e-6
 
 # Parameters for Rician noise model - used in T2 calculation
 MAX_RICIAN_NOISE = 20.0
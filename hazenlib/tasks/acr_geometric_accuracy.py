@@ -180,7 +180,7 @@ class ACRGeometricAccuracy(HazenTask):
             img_path = os.path.realpath(
                 os.path.join(self.report_path, f"{self.img_desc(dcm)}.png")
             )
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
         
         return length_dict["Horizontal Distance"], length_dict["Vertical Distance"]
@@ -271,7 +271,7 @@ class ACRGeometricAccuracy(HazenTask):
             img_path = os.path.realpath(
                 os.path.join(self.report_path, f"{self.img_desc(dcm)}.png")
             )
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
 
         return (
@@ -17,6 +17,7 @@ yassine.azma@rmh.nhs.uk
 
 import os
 import sys
+import math
 import traceback
 import numpy as np
 
@@ -24,6 +25,28 @@ from hazenlib.HazenTask import HazenTask
 from hazenlib.ACRObject import ACRObject
 
 
+def roi_box(centre, half_size, shape):
+    """Bounding box of an ROI, clipped to the image
+
+    Args:
+        centre (tuple): row and column of the ROI centre
+        half_size (tuple): half height and half width of the ROI, in pixels.
+            Only the magnitude is used, as the ellipse scaling factors can be
+            negative when the phantom is close to the edge of the FoV
+        shape (tuple): image shape
+
+    Returns:
+        tuple: row and column slices of the box, and the row (as a column
+            vector) and column (as a row vector) coordinates of its pixels
+    """
+    box = tuple(
+        slice(max(int(np.floor(c - h)), 0), min(int(np.ceil(c + h)) + 1, n))
+        for c, h, n in zip(centre, np.abs(half_size), shape)
+    )
+    y, x = (coords.astype(np.float64) for coords in np.ogrid[box])
+    return box, y, x
+
+
 class ACRGhosting(HazenTask):
     """Ghosting measurement class for DICOM images of the ACR phantom
 
@@ -73,29 +96,31 @@ class ACRGhosting(HazenTask):
         """
         img = dcm.pixel_array
         res = dcm.PixelSpacing  # In-plane resolution from metadata
-        r_large = np.ceil(80 / res[0]).astype(
-            int
-        )  # Required pixel radius to produce ~200cm2 ROI
+        r_large = math.ceil(80 / res[0])  # Required pixel radius to produce ~200cm2 ROI
 
         if self.ACR_obj.MediumACRPhantom==True:
-            r_large = np.ceil(np.sqrt(16000*0.95 / np.pi) / res[0]).astype(int) #Making it a 95% smaller than 160cm^2 (16000mm^2) to avoid the bit at the top
+            r_large = math.ceil(math.sqrt(16000*0.95 / math.pi) / res[0]) #Making it a 95% smaller than 160cm^2 (16000mm^2) to avoid the bit at the top
 
         dims = img.shape
 
         mask = self.ACR_obj.mask_image
         cxy = self.ACR_obj.centre
 
-        ##Bug Fix: For some reason this started at 1 meaning that everything was offset by 1,1. I changed this back to start at 0 now everything looks centered. 
-        nx = np.linspace(0, dims[0]-1, dims[0])
-        ny = np.linspace(0, dims[1]-1, dims[1])
-
-        x, y = np.meshgrid(nx, ny)
-
+        # Each ROI mask only covers the ROI's bounding box; x and y are the pixel
+        # column and row coordinates within it, starting at 0 for the image
+        lroi_box, y, x = roi_box(
+            (cxy[1] + np.divide(5, res[1]), cxy[0]), (r_large, r_large), dims
+        )
         lroi = np.square(x - cxy[0]) + np.square(y - cxy[1] - np.divide(5, res[1])) <= np.square(r_large)
-        sad = 2 * np.ceil(np.sqrt(1000 / (4 * np.pi)) / res[0])  # Short axis diameter for an ellipse of 10cm2 with a 1:4 axis ratio
+        ellipse_radius = 10 / res[0]
+        sad = 2 * math.ceil(math.sqrt(1000 / (4 * math.pi)) / res[0])  # Short axis diameter for an ellipse of 10cm2 with a 1:4 axis ratio
+
+        # columns and rows that contain part of the phantom mask
+        mask_cols = np.any(mask, axis=0)
+        mask_rows = np.any(mask, axis=1)
 
         # WEST ELLIPSE
-        w_point = np.argwhere(np.sum(mask, 0) > 0)[0]  # find first column in mask
+        w_point = mask_cols.argmax()  # find first column in mask
         w_centre = [cxy[1], np.floor(w_point / 2)]  # initialise centre of ellipse
         left_fov_to_centre = (
             w_centre[1] - sad / 2 - 5
@@ -107,11 +132,16 @@ class ACRGhosting(HazenTask):
             diffs = [left_fov_to_centre, centre_to_left_phantom - w_point]
             ind = diffs.index(max(diffs, key=abs))
             w_factor = (sad / 2) / (
-                sad / 2 - np.absolute(diffs[ind])
+                sad / 2 - abs(diffs[ind])
             )  # ellipse scaling factor
         else:
             w_factor = 1
 
+        w_box, y, x = roi_box(
+            w_centre,
+            (4 * w_factor * ellipse_radius, ellipse_radius / w_factor),
+            dims,
+        )
         w_ellipse = np.square((y - w_centre[0]) / (4 * w_factor)) + np.square(
             (x - w_centre[1]) * w_factor
         ) <= np.square(
@@ -119,10 +149,10 @@ class ACRGhosting(HazenTask):
         )  # generate ellipse mask
 
         # EAST ELLIPSE
-        e_point = np.argwhere(np.sum(mask, 0) > 0)[-1]  # find last column in mask
+        e_point = len(mask_cols) - 1 - mask_cols[::-1].argmax()  # find last column in mask
         e_centre = [
             cxy[1],
-            e_point + np.ceil((dims[1] - e_point) / 2),
+            e_point + math.ceil((dims[1] - e_point) / 2),
         ]  # initialise centre of ellipse
         right_fov_to_centre = (
             e_centre[1] + sad / 2 + 5
@@ -137,11 +167,16 @@ class ACRGhosting(HazenTask):
             ]
             ind = diffs.index(max(diffs, key=abs))
             e_factor = (sad / 2) / (
-                sad / 2 - np.absolute(diffs[ind])
+                sad / 2 - abs(diffs[ind])
             )  # ellipse scaling factor
         else:
             e_factor = 1
 
+        e_box, y, x = roi_box(
+            e_centre,
+            (4 * e_factor * ellipse_radius, ellipse_radius / e_factor),
+            dims,
+        )
         e_ellipse = np.square((y - e_centre[0]) / (4 * e_factor)) + np.square(
             (x - e_centre[1]) * e_factor
         ) <= np.square(
@@ -149,8 +184,8 @@ class ACRGhosting(HazenTask):
         )  # generate ellipse mask
 
         # NORTH ELLIPSE
-        n_point = np.argwhere(np.sum(mask, 1) > 0)[0]  # find first row in mask
-        n_centre = [np.round(n_point / 2), cxy[0]]  # initialise centre of ellipse
+        n_point = mask_rows.argmax()  # find first row in mask
+        n_centre = [round(n_point / 2), cxy[0]]  # initialise centre of ellipse
         top_fov_to_centre = (
             n_centre[0] - sad / 2 - 5
         )  # edge of ellipse towards top FoV (+ tolerance)
@@ -161,11 +196,16 @@ class ACRGhosting(HazenTask):
             diffs = [top_fov_to_centre, centre_to_top_phantom - n_point]
             ind = diffs.index(max(diffs, key=abs))
             n_factor = (sad / 2) / (
-                sad / 2 - np.absolute(diffs[ind])
+                sad / 2 - abs(diffs[ind])
             )  # ellipse scaling factor
         else:
             n_factor = 1
 
+        n_box, y, x = roi_box(
+            n_centre,
+            (ellipse_radius / n_factor, 4 * n_factor * ellipse_radius),
+            dims,
+        )
         n_ellipse = np.square((y - n_centre[0]) * n_factor) + np.square(
             (x - n_centre[1]) / (4 * n_factor)
         ) <= np.square(
@@ -173,9 +213,9 @@ class ACRGhosting(HazenTask):
         )  # generate ellipse mask
 
         # SOUTH ELLIPSE
-        s_point = np.argwhere(np.sum(mask, 1) > 0)[-1]  # find last row in mask
+        s_point = len(mask_rows) - 1 - mask_rows[::-1].argmax()  # find last row in mask
         s_centre = [
-            s_point + np.round((dims[1] - s_point) / 2),
+            s_point + round((dims[1] - s_point) / 2),
             cxy[0],
         ]  # initialise centre of ellipse
         bottom_fov_to_centre = (
@@ -189,22 +229,27 @@ class ACRGhosting(HazenTask):
             ]
             ind = diffs.index(max(diffs, key=abs))
             s_factor = (sad / 2) / (
-                sad / 2 - np.absolute(diffs[ind])
+                sad / 2 - abs(diffs[ind])
             )  # ellipse scaling factor
         else:
             s_factor = 1
 
+        s_box, y, x = roi_box(
+            s_centre,
+            (ellipse_radius / s_factor, 4 * s_factor * ellipse_radius),
+            dims,
+        )
         s_ellipse = np.square((y - s_centre[0]) * s_factor) + np.square(
             (x - s_centre[1]) / (4 * s_factor)
         ) <= np.square(10 / res[0])
 
-        large_roi_val = np.mean(img[np.nonzero(lroi)])
-        w_ellipse_val = np.mean(img[np.nonzero(w_ellipse)])
-        e_ellipse_val = np.mean(img[np.nonzero(e_ellipse)])
-        n_ellipse_val = np.mean(img[np.nonzero(n_ellipse)])
-        s_ellipse_val = np.mean(img[np.nonzero(s_ellipse)])
+        large_roi_val = np.mean(img[lroi_box][lroi])
+        w_ellipse_val = np.mean(img[w_box][w_ellipse])
+        e_ellipse_val = np.mean(img[e_box][e_ellipse])
+        n_ellipse_val = np.mean(img[n_box][n_ellipse])
+        s_ellipse_val = np.mean(img[s_box][s_ellipse])
 
-        psg = 100 * np.absolute(
+        psg = 100 * abs(
             ((n_ellipse_val + s_ellipse_val) - (w_ellipse_val + e_ellipse_val))
             / (2 * large_roi_val)
         )
@@ -230,7 +275,9 @@ class ACRGhosting(HazenTask):
                 c="black",
             )
             axes[1].scatter(cxy[0], cxy[1], c="red")
-            axes[1].imshow(lroi,alpha=0.4)
+            lroi_image = np.zeros(dims, dtype=bool)
+            lroi_image[lroi_box] = lroi
+            axes[1].imshow(lroi_image, alpha=0.4)
             circle1 = plt.Circle((cxy[0], cxy[1]), self.ACR_obj.radius, color='r',fill=False)
             axes[1].add_patch(circle1)
 
@@ -296,7 +343,7 @@ class ACRGhosting(HazenTask):
             img_path = os.path.realpath(
                 os.path.join(self.report_path, f"{self.img_desc(dcm)}.png")
             )
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
 
         return psg
@@ -320,7 +320,7 @@ class ACRSliceThickness(HazenTask):
                     self.report_path, f"{self.img_desc(dcm)}_slice_thickness.png"
                 )
             )
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
 
         return slice_thickness
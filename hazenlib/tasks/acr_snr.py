@@ -146,7 +146,7 @@ class ACRSNR(HazenTask):
         )
         return normalised_snr_factor
 
-    def filtered_image(self, dcm: pydicom.Dataset) -> np.array:
+    def filtered_image(self, dcm: pydicom.Dataset or np.ndarray) -> np.array:
         """Apply filtering to a pixel array (image)
 
         Notes:
@@ -154,12 +154,15 @@ class ACRSNR(HazenTask):
             uses uniform_filter SciPy function
 
         Args:
-            dcm (pydicom.Dataset): DICOM image object
+            dcm (pydicom.Dataset or np.ndarray): DICOM image object, or its pixel array as int
 
         Returns:
             np.array: pixel array of the filtered image
         """
-        a = dcm.pixel_array.astype("int")
+        if type(dcm) == np.ndarray:
+            a = dcm
+        else:
+            a = dcm.pixel_array.astype("int")
 
         # filter size = 9, following MATLAB code and McCann 2013 paper for head coil, although note McCann 2013
         # recommends 25x25 for body coil.
@@ -180,8 +183,8 @@ class ACRSNR(HazenTask):
         """
         a = dcm.pixel_array.astype("int")
 
-        # Convolve image with boxcar/uniform kernel
-        imsmoothed = self.filtered_image(dcm)
+        # Convolve image with boxcar/uniform kernel, reusing the pixel array decoded above
+        imsmoothed = self.filtered_image(a)
 
         # Subtract smoothed array from original
         imnoise = a - imsmoothed
@@ -302,7 +305,7 @@ class ACRSNR(HazenTask):
             img_path = os.path.realpath(
                 os.path.join(self.report_path, f"{self.img_desc(dcm)}_smoothing.png")
             )
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
 
         return snr, normalised_snr
@@ -374,7 +377,7 @@ class ACRSNR(HazenTask):
                     self.report_path, f"{self.img_desc(dcm1)}_snr_subtraction.png"
                 )
             )
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
 
         return snr, normalised_snr
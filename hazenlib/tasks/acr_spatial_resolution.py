@@ -322,37 +322,29 @@ class ACRSpatialResolution(HazenTask):
         temp_y = np.linspace(1, resample_crop_img.shape[0], resample_crop_img.shape[0])
         x_resample, y_resample = np.meshgrid(temp_x, temp_y)
 
-        erf = []
-        n_inside_roi = []
         if edge_type == "horizontal":
             diffY = (y_resample - 1) - mid_loc[0]
-            x_prime = x_resample + resamp_factor * diffY * slope
-
-            x_min, x_max = np.min(x_prime).astype(int), np.max(x_prime).astype(int)
-
-            for k in range(x_min, x_max):
-                erf_val = np.mean(resample_crop_img[(x_prime >= k) & (x_prime < k + 1)])
-                erf.append(erf_val)
-                number_nonzero = np.count_nonzero(
-                    resample_crop_img[(x_prime >= k) & (x_prime < k + 1)]
-                )
-                n_inside_roi.append(number_nonzero)
+            prime = x_resample + resamp_factor * diffY * slope
         else:
             diffX = (x_resample.shape[0] - 1) - x_resample - mid_loc[1]
-            y_prime = np.flipud(y_resample) + resamp_factor * diffX * slope
+            prime = np.flipud(y_resample) + resamp_factor * diffX * slope
 
-            y_min, y_max = np.min(y_prime).astype(int), np.max(y_prime).astype(int)
+        p_min, p_max = np.min(prime).astype(int), np.max(prime).astype(int)
 
-            for k in range(y_min, y_max):
-                erf_val = np.mean(resample_crop_img[(y_prime >= k) & (y_prime < k + 1)])
-                erf.append(erf_val)
-                number_nonzero = np.count_nonzero(
-                    resample_crop_img[(y_prime >= k) & (y_prime < k + 1)]
-                )
-                n_inside_roi.append(number_nonzero)
+        # bin every pixel by the integer part of its projected position in a single pass,
+        # bin k holds the pixels with k <= prime < k + 1 for k in range(p_min, p_max)
+        bins = np.floor(prime).astype(int).ravel()
+        values = resample_crop_img.ravel()
+        in_range = (bins >= p_min) & (bins < p_max)
+        bins = bins[in_range] - p_min
+        values = values[in_range]
 
-        erf = np.array(erf)
-        n_inside_roi = np.array(n_inside_roi)
+        n_bins = max(p_max - p_min, 0)
+        counts = np.bincount(bins, minlength=n_bins)
+        sums = np.bincount(bins, weights=values, minlength=n_bins)
+        n_inside_roi = np.bincount(bins, weights=values != 0, minlength=n_bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            erf = sums / counts
 
         erf = erf[n_inside_roi == np.max(n_inside_roi)]
 
@@ -564,7 +556,7 @@ class ACRSpatialResolution(HazenTask):
             img_path = os.path.realpath(
                 os.path.join(self.report_path, f"{self.img_desc(dcm)}_MTF.png")
             )
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
 
         return eff_raw_res, eff_fit_res
@@ -669,7 +661,7 @@ class ACRSpatialResolution(HazenTask):
 
             img_path = os.path.realpath(
             os.path.join(self.report_path, f"{self.img_desc(dcm)}_DotPairs.png"))
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
 
         return Results
\ No newline at end of file
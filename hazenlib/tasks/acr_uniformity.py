@@ -18,8 +18,10 @@ yassine.azma@rmh.nhs.uk
 
 import os
 import sys
+import math
 import traceback
 import numpy as np
+from scipy import signal
 
 from hazenlib.HazenTask import HazenTask
 from hazenlib.ACRObject import ACRObject
@@ -75,20 +77,14 @@ class ACRUniformity(HazenTask):
         """
         img = dcm.pixel_array
         res = dcm.PixelSpacing  # In-plane resolution from metadata
-        r_large = np.ceil(80 / res[0]).astype(
-            int
-        )  # Required pixel radius to produce ~200cm2 ROI
-        r_small = np.ceil(np.sqrt(100 / np.pi) / res[0]).astype(
-            int
-        )  # Required pixel radius to produce ~1cm2 ROI
+        r_large = math.ceil(80 / res[0])  # Required pixel radius to produce ~200cm2 ROI
+        r_small = math.ceil(math.sqrt(100 / math.pi) / res[0])  # Required pixel radius to produce ~1cm2 ROI
 
         if self.ACR_obj.MediumACRPhantom==True:
-            r_large = np.ceil(np.sqrt(16000*0.95 / np.pi) / res[0]).astype(int) #Making it a 95% smaller than 160cm^2 (16000mm^2) to avoid the bit at the top
+            r_large = math.ceil(math.sqrt(16000*0.95 / math.pi) / res[0]) #Making it a 95% smaller than 160cm^2 (16000mm^2) to avoid the bit at the top
 
 
-        d_void = np.ceil(5 / res[0]).astype(
-            int
-        )  # Offset distance for rectangular void at top of phantom
+        d_void = math.ceil(5 / res[0])  # Offset distance for rectangular void at top of phantom
         dims = img.shape  # Dimensions of image
 
         cxy = self.ACR_obj.centre
@@ -101,53 +97,59 @@ class ACRUniformity(HazenTask):
         lroi = self.ACR_obj.circular_mask([cxy[0], cxy[1] + d_void], r_large, dims)
         img_masked = lroi * img
 
-        half_max = np.percentile(img_masked[np.nonzero(img_masked)], 50)
+        half_max = np.percentile(img_masked[img_masked != 0], 50)
 
         min_image = img_masked * (img_masked < half_max)
         max_image = img_masked * (img_masked > half_max)
 
-        min_rows, min_cols = np.nonzero(min_image)[0], np.nonzero(min_image)[1]
-        max_rows, max_cols = np.nonzero(max_image)[0], np.nonzero(max_image)[1]
+        # offsets from each candidate pixel to the pixels of its 1cm2 ROI, as a
+        # correlation kernel, so that the ROI sums for every pixel are one pass
+        offset_rows = coords[0] - cxy[0] - d_void
+        offset_cols = coords[1] - cxy[1]
+        half_rows = np.abs(offset_rows).max()
+        half_cols = np.abs(offset_cols).max()
+        kernel = np.zeros((2 * half_rows + 1, 2 * half_cols + 1))
+        kernel[offset_rows + half_rows, offset_cols + half_cols] = 1
+        n_samples = len(offset_rows)
 
         mean_array = np.zeros(img_masked.shape)
 
-        def uniformity_iterator(masked_image, sample_mask, rows, cols):
-            """Iterate through a pixel array and determine mean value
+        def uniformity_means(masked_image):
+            """Mean value of the ROI around each nonzero pixel of masked_image
+
+            ROIs that reach a zero pixel of masked_image are given a mean of 0.
 
             Args:
                 masked_image (np.array): subset of pixel array
-                sample_mask (np.array): _description_
-                rows (np.array): 1D array
-                cols (np.array): 1D array
 
             Returns:
                 np.array: array of mean values
             """
-            coords = np.nonzero(sample_mask)  # Coordinates of mask
-            for idx, (row, col) in enumerate(zip(rows, cols)):
-                centre = [row, col]
-                translate_mask = [
-                    coords[0] + centre[0] - cxy[0] - d_void,
-                    coords[1] + centre[1] - cxy[1],
-                ]
-                values = masked_image[translate_mask[0], translate_mask[1]]
-                if np.count_nonzero(values) < np.count_nonzero(sample_mask):
-                    mean_val = 0
-                else:
-                    mean_val = np.mean(values[np.nonzero(values)])
-
-                mean_array[row, col] = mean_val
+            candidates = masked_image > 0
+            # convolving with the flipped kernel correlates. Counts, and sums of
+            # integer pixels, are integers: rounding removes the FFT error.
+            roi_sums = signal.fftconvolve(masked_image, kernel[::-1, ::-1], mode="same")
+            if np.issubdtype(masked_image.dtype, np.integer):
+                roi_sums = np.rint(roi_sums)
+            roi_counts = np.rint(
+                signal.fftconvolve(candidates, kernel[::-1, ::-1], mode="same")
+            )
+            full = candidates & (roi_counts == n_samples)
+            mean_array[full] = roi_sums[full] / n_samples
 
             return mean_array
 
-        min_data = uniformity_iterator(min_image, base_mask, min_rows, min_cols)
-        max_data = uniformity_iterator(max_image, base_mask, max_rows, max_cols)
+        min_data = uniformity_means(min_image)
+        max_data = uniformity_means(max_image)
 
         sig_max = np.max(max_data)
-        sig_min = np.min(min_data[np.nonzero(min_data)])
+        sig_min = np.min(min_data[min_data != 0])
 
-        max_loc = np.where(max_data == sig_max)
-        min_loc = np.where(min_data == sig_min)
+        # first pixel (in row-major order) of the max and min ROI centres
+        max_loc = np.unravel_index(np.argmax(max_data), max_data.shape)
+        min_loc = np.unravel_index(
+            np.argmin(np.where(min_data != 0, min_data, np.inf)), min_data.shape
+        )
 
         piu = 100 * (1 - (sig_max - sig_min) / (sig_max + sig_min))
 
@@ -208,7 +210,7 @@ class ACRUniformity(HazenTask):
             img_path = os.path.realpath(
                 os.path.join(self.report_path, f"{self.img_desc(dcm)}.png")
             )
-            fig.savefig(img_path)
+            self.save_report_fig(fig, img_path)
             self.report_files.append(img_path)
 
         return piu
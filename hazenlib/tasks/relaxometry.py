@@ -121,16 +121,18 @@ calculation of mean if elements are not 0 or 1.
 Get r-squared measure of fit.
 
 """
+import functools
 import json
 import os.path
 import pathlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 import cv2 as cv
 import numpy as np
 import matplotlib.pyplot as plt
 import pydicom
 import skimage.morphology
-import scipy.ndimage
 import scipy.optimize
 from scipy.interpolate import UnivariateSpline
 from scipy.special import i0e, ive
@@ -220,8 +222,10 @@ class Relaxometry(HazenTask):
         if calc in ["T1", "t1"]:
             image_stack = T1ImageStack(self.dcm_list)
             try:
-                template_dcm = pydicom.read_file(
-                    TEMPLATE_VALUES[f"plate{plate_number}"][relax_str]["filename"]
+                # pixel data is only read if the template is not already cached
+                template_dcm = pydicom.dcmread(
+                    TEMPLATE_VALUES[f"plate{plate_number}"][relax_str]["filename"],
+                    defer_size="1 KB",
                 )
             except KeyError:
                 print(
@@ -232,8 +236,10 @@ class Relaxometry(HazenTask):
         elif calc in ["T2", "t2"]:
             image_stack = T2ImageStack(self.dcm_list)
             try:
-                template_dcm = pydicom.read_file(
-                    TEMPLATE_VALUES[f"plate{plate_number}"][relax_str]["filename"]
+                # pixel data is only read if the template is not already cached
+                template_dcm = pydicom.dcmread(
+                    TEMPLATE_VALUES[f"plate{plate_number}"][relax_str]["filename"],
+                    defer_size="1 KB",
                 )
             except KeyError:
                 print(
@@ -306,7 +312,7 @@ class Relaxometry(HazenTask):
                     ),
                     "b-",
                 )
-                plt.plot(rois[i].times, rois[i].means, "rx")
+                plt.plot(rois[i].times, image_stack.ROI_means[:, i], "rx")
                 if i == 14:
                     plt.title(
                         f"[Free water] fit={image_stack.relax_times[i]:.4g}", fontsize=8
@@ -358,7 +364,8 @@ class Relaxometry(HazenTask):
                 # fit_paramters (T1) = [[T1, s0, A1] for each ROI]
                 # fit_parameters (T2) = [[T2, s0, C] for each ROI]
                 "ROI_means": {
-                    i: im.means for i, im in enumerate(image_stack.ROI_time_series)
+                    i: im.means.tolist()
+                    for i, im in enumerate(image_stack.ROI_time_series)
                 },
                 "fit_parameters": [
                     tuple(param[0].tolist()) for param in image_stack.relax_fit
@@ -378,6 +385,69 @@ class Relaxometry(HazenTask):
         return results
 
 
+def process_study(input_data, calc, plate_number, **kwargs):
+    """
+    Run the relaxometry task on a single study.
+
+    Parameters
+    ----------
+    input_data : list
+        DICOM file paths for one plate of the relaxometry phantom.
+    calc : str
+        Whether to calculate T1 or T2 relaxation.
+    plate_number : int
+        Plate number of the HPD relaxometry phantom (either 4 or 5).
+    **kwargs
+        ``report`` and ``report_dir`` are passed to ``Relaxometry``, anything
+        else (e.g. ``verbose``) to ``Relaxometry.run``.
+
+    Returns
+    -------
+    dict
+        Results dictionary from ``Relaxometry.run``.
+    """
+    task_kwargs = {k: kwargs.pop(k) for k in ("report", "report_dir") if k in kwargs}
+    task = Relaxometry(input_data=input_data, **task_kwargs)
+    return task.run(calc=calc, plate_number=plate_number, **kwargs)
+
+
+def batch_relaxometry(studies, calc, plate_number, n_jobs=None, **kwargs):
+    """
+    Run the relaxometry task on several studies in parallel.
+
+    Each study (template fit, ROI extraction and curve fitting) is independent
+    so they are processed in separate worker processes.
+
+    Parameters
+    ----------
+    studies : list of lists
+        DICOM file paths, one list per study.
+    calc : str
+        Whether to calculate T1 or T2 relaxation.
+    plate_number : int
+        Plate number of the HPD relaxometry phantom (either 4 or 5).
+    n_jobs : int, optional
+        Number of worker processes. The default is None, which uses 70% of
+        the available CPUs.
+    **kwargs
+        Passed to ``process_study``.
+
+    Returns
+    -------
+    list of dict
+        Results dictionary for each study, in the same order as ``studies``.
+    """
+    if n_jobs is None:
+        n_jobs = max(1, int(0.7 * (os.cpu_count() or 1)))
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        futures = [
+            pool.submit(process_study, study, calc, plate_number, **kwargs)
+            for study in studies
+        ]
+        return [future.result() for future in futures]
+
+
 def outline_mask(im):
     """
     Create contour lines to outline pixels.
@@ -392,43 +462,58 @@ def outline_mask(im):
 
     Returns
     -------
-    lines : list
-        List of coordinates of outlines (see Example below).
+    lines : np.array
+        Array (n,4) of outline segments. Each row is
+        ``[row_start, row_end, col_start, col_end]`` (see Example below).
 
     Example
     -------
     >>> lines = outline_mask(combined_ROI_map)
-    >>> for line in lines:
-            plt.plot(line[1], line[0], color='r', alpha=1)
+    >>> plt.plot(lines[:, 2:].T, lines[:, :2].T, color='r', alpha=1)
 
     References
     ----------
     .. [1] stackoverflow.com/questions/40892203/can-matplotlib-contours-match-pixel-edges
 
     """
-    lines = []
     pad = np.pad(im, [(1, 1), (1, 1)])  # zero padding
 
     im0 = np.abs(np.diff(pad, n=1, axis=0))[:, 1:]
     im1 = np.abs(np.diff(pad, n=1, axis=1))[1:, :]
 
+    # horizontal lines along the top edge of each run of edge pixels
     im0 = np.diff(im0, n=1, axis=1)
-    starts = np.argwhere(im0 == 1)
-    ends = np.argwhere(im0 == -1)
-    lines += [
-        ([s[0] - 0.5, s[0] - 0.5], [s[1] + 0.5, e[1] + 0.5])
-        for s, e in zip(starts, ends)
-    ]
-
+    starts, ends = _edge_starts_ends(im0)
+    n = min(len(starts), len(ends))
+    lines_h = np.empty((n, 4), dtype=np.float32)
+    lines_h[:, 0] = starts[:n, 0] - 0.5
+    lines_h[:, 1] = starts[:n, 0] - 0.5
+    lines_h[:, 2] = starts[:n, 1] + 0.5
+    lines_h[:, 3] = ends[:n, 1] + 0.5
+
+    # vertical lines, found on the transposed array
     im1 = np.diff(im1, n=1, axis=0).T
-    starts = np.argwhere(im1 == 1)
-    ends = np.argwhere(im1 == -1)
-    lines += [
-        ([s[1] + 0.5, e[1] + 0.5], [s[0] - 0.5, s[0] - 0.5])
-        for s, e in zip(starts, ends)
-    ]
+    starts, ends = _edge_starts_ends(im1)
+    n = min(len(starts), len(ends))
+    lines_v = np.empty((n, 4), dtype=np.float32)
+    lines_v[:, 0] = starts[:n, 1] + 0.5
+    lines_v[:, 1] = ends[:n, 1] + 0.5
+    lines_v[:, 2] = starts[:n, 0] - 0.5
+    lines_v[:, 3] = starts[:n, 0] - 0.5
 
-    return lines
+    return np.concatenate((lines_h, lines_v))
+
+
+def _edge_starts_ends(edges):
+    """
+    Coordinates of the starts (+1) and ends (-1) of edge runs.
+
+    A single ``np.argwhere`` pass finds every nonzero element, which is then
+    split by sign, rather than scanning the array once for each value.
+    """
+    coords = np.argwhere(edges)
+    signs = edges[coords[:, 0], coords[:, 1]]
+    return coords[signs == 1], coords[signs == -1]
 
 
 def transform_coords(coords, rt_matrix, input_row_col=True, output_row_col=True):
@@ -472,18 +557,20 @@ def transform_coords(coords, rt_matrix, input_row_col=True, output_row_col=True)
         Returns (n,2) array of transformed coordinates.
 
     """
-    in_coords = np.array(coords)  # ensure using np array
+    in_coords = np.asarray(coords)  # ensure using np array
+    rt_matrix = np.asarray(rt_matrix)
 
-    if input_row_col:  # convert to col_row (xy) format
-        in_coords = np.flip(in_coords, axis=1)
+    if input_row_col:  # convert to col_row (xy) format, a view not a copy
+        in_coords = in_coords[:, ::-1]
 
-    out_coords = cv.transform(np.array([in_coords]), rt_matrix)[
-        0
-    ]  # reduce to two dimensions
-    # out_coords = out_coords
+    # rotation then translation, equivalent to cv.transform for (n,2) points
+    out_coords = in_coords @ rt_matrix[:, :2].T + rt_matrix[:, 2]
+    if np.issubdtype(in_coords.dtype, np.integer):
+        # as cv.transform, integer (pixel) coordinates are rounded
+        out_coords = np.rint(out_coords).astype(in_coords.dtype)
 
     if output_row_col:
-        out_coords = np.flip(out_coords, axis=1)
+        out_coords = out_coords[:, ::-1]
 
     return out_coords
 
@@ -527,6 +614,91 @@ def pixel_rescale(dcm):
         return pydicom.pixel_data_handlers.util.apply_modality_lut(dcm.pixel_array, dcm)
 
 
+def magnitude_8bit(px):
+    """
+    Normalise the magnitude of a pixel array to 0-255 as uint8.
+
+    Taking ``abs()`` copies the whole image, so it is only done when there are
+    negative values (e.g. signed/real images). Magnitude images are normalised
+    directly.
+
+    Parameters
+    ----------
+    px : np.array
+        Pixel array, e.g. from ``pixel_rescale``.
+
+    Returns
+    -------
+    np.array
+        ``abs(px)`` scaled to the range 0-255, as uint8.
+    """
+    if px.min() < 0:
+        px = np.abs(px)
+    return cv.normalize(px, None, 0, 255, norm_type=cv.NORM_MINMAX, dtype=cv.CV_8U)
+
+
+# (template filename, target shape) -> (template_px, template8bit), keeping
+# only the most recently used templates
+TEMPLATE_CACHE_SIZE = 8
+_template_8bit_cache = OrderedDict()
+
+
+def template_8bit(template_dcm, target_shape):
+    """
+    Rescale template pixels and convert them to 8-bit for template fitting.
+
+    The same template files are fitted to every image stack, so the result is
+    cached by template file name and target image shape, for the
+    ``TEMPLATE_CACHE_SIZE`` most recently used templates. Templates without a
+    file name (e.g. created in memory) are not cached.
+
+    Parameters
+    ----------
+    template_dcm : pydicom.dataset.FileDataset
+        DICOM template object.
+    target_shape : tuple
+        Shape of the image the template will be fitted to. The template is
+        zero padded if it is smaller than this.
+
+    Returns
+    -------
+    template_px : np.array
+        Template pixel array, after scaling in 0028,1052 and 0028,1053 is
+        applied, padded if required. Read only.
+    template8bit : np.array
+        Magnitude of ``template_px`` normalised to 0-255 as uint8. Read only.
+    """
+    filename = getattr(template_dcm, "filename", None)
+    key = (filename, tuple(target_shape))
+    if filename is not None and key in _template_8bit_cache:
+        _template_8bit_cache.move_to_end(key)
+        return _template_8bit_cache[key]
+
+    template_px = pixel_rescale(template_dcm)
+
+    # Determine difference in shape
+    pad_size = np.subtract(template_px.shape, target_shape)
+    assert pad_size[0] == pad_size[1], "Image matrices must be square."
+    if pad_size[0] < 0:  # pad template
+        # add pixels to template if smaller than target
+        template_px = np.pad(template_px, pad_width=(0, -pad_size[0]))
+
+    # Always fit on magnitude images for simplicity. May be suboptimal
+    template8bit = magnitude_8bit(template_px)
+
+    # shared between image stacks, so make sure they are never modified. Without
+    # padding or rescaling template_px can be the dataset's own pixel_array, so
+    # copy it rather than making that read only
+    template_px = template_px.copy()
+    template_px.flags.writeable = False
+    template8bit.flags.writeable = False
+    if filename is not None:
+        _template_8bit_cache[key] = template_px, template8bit
+        if len(_template_8bit_cache) > TEMPLATE_CACHE_SIZE:
+            _template_8bit_cache.popitem(last=False)
+    return template_px, template8bit
+
+
 class ROITimeSeries:
     """
     Samples at one image location (ROI) at numerous sample times.
@@ -539,15 +711,22 @@ class ROITimeSeries:
     ----------
     POI_mask : array
         Array the same size as the image. All values are 0, except a single 1
-        at the point of interest (POI), the centre of the ROI.
+        at the point of interest (POI), the centre of the ROI. Only built when
+        requested.
 
     ROI_mask : array
         Array the same size as the image. Values in the ROI are coded as 1s,
-        all other values are zero.
+        all other values are zero. Only built when requested (e.g. to outline
+        the ROIs in ``ImageStack.plot_rois``).
 
-    pixel_values : list of arrays
-        List of 1-D arrays of pixel values in ROI. The variance could be used
-        as a measure of ROI homogeneity to identify  incorrect sphere location.
+    ROI_rows, ROI_cols : arrays
+        Row and column indices of the pixels in the ROI.
+
+    pixel_values : array
+        Array (n_images, n_pixels) of pixel values in ROI. The variance could
+        be used as a measure of ROI homogeneity to identify  incorrect sphere
+        location. Gathered from the images when first accessed, unless set by
+        ``ImageStack.generate_time_series``.
 
     times : list of floats
         If ``time_attr`` was used in the constructor, this list contains the
@@ -557,11 +736,19 @@ class ROITimeSeries:
     trs : list of floats
         Values of TR for each image.
 
-    means : list of floats
+    means : array
         Mean pixel value of ROI for each image in series.
     """
 
-    def __init__(self, dcm_images, poi_coords_row_col, time_attr):
+    def __init__(
+        self,
+        dcm_images,
+        poi_coords_row_col,
+        time_attr,
+        pixel_arrays=None,
+        times=None,
+        trs=None,
+    ):
         """
         Create ROITimeSeries for ROI parameters at sequential scans.
 
@@ -578,13 +765,20 @@ class ROITimeSeries:
             ``'InversionTime'`` or ``'EchoTime'``) and store in the list
             ``self.times``. The default is ``None``, which does not create
             ``self.times``
+        pixel_arrays : list or array of 2D arrays, optional
+            Rescaled pixel arrays of ``dcm_images`` (see ``pixel_rescale``),
+            typically ``ImageStack.pixel_arrays``. If ``None`` they are
+            calculated from ``dcm_images``. The default is ``None``.
+        times, trs : lists of floats, optional
+            Values of ``time_attr`` and TR for each image, typically
+            ``ImageStack.times`` and ``ImageStack.trs``. If ``None`` they are
+            looked up in the DICOM headers. The default is ``None``.
         """
+        self.dcm_images = dcm_images
+        self._pixel_arrays = pixel_arrays
 
-        self.POI_mask = np.zeros(
-            (dcm_images[0].pixel_array.shape[0], dcm_images[0].pixel_array.shape[1]),
-            dtype=np.int8,
-        )
-        self.POI_mask[poi_coords_row_col[0], poi_coords_row_col[1]] = 1
+        self.image_shape = (dcm_images[0].Rows, dcm_images[0].Columns)
+        self.POI_row_col = tuple(poi_coords_row_col)
 
         kernel = skimage.morphology.square(5)
         """kernel
@@ -594,30 +788,62 @@ class ROITimeSeries:
             ``None``.
         """
 
-        self.ROI_mask = np.zeros_like(self.POI_mask)
-        self.ROI_mask = scipy.ndimage.filters.convolve(self.POI_mask, kernel)
+        # The ROI is the kernel centred on the POI. Keep the indices of its
+        # pixels rather than full image masks, and gather them from each image
+        offsets = np.argwhere(kernel > 0) - np.array(kernel.shape) // 2
+        self.ROI_rows = poi_coords_row_col[0] + offsets[:, 0]
+        self.ROI_cols = poi_coords_row_col[1] + offsets[:, 1]
 
-        self.times = [x[time_attr].value.real for x in dcm_images]
-        self.pixel_values = [
-            pixel_rescale(img)[self.ROI_mask > 0] for img in dcm_images
-        ]
+        if times is None:
+            times = [x[time_attr].value.real for x in dcm_images]
+        self.times = times
+
+        if trs is None:
+            trs = [x["RepetitionTime"].value.real for x in dcm_images]
+        self.trs = trs
+
+    @property
+    def POI_mask(self):
+        """Array the same size as the image with the POI coded as 1."""
+        poi_mask = np.zeros(self.image_shape, dtype=np.int8)
+        poi_mask[self.POI_row_col] = 1
+        return poi_mask
 
-        self.trs = [x["RepetitionTime"].value.real for x in dcm_images]
+    @property
+    def ROI_mask(self):
+        """Array the same size as the image with the ROI coded as 1s."""
+        roi_mask = np.zeros(self.image_shape, dtype=np.int8)
+        roi_mask[self.ROI_rows, self.ROI_cols] = 1
+        return roi_mask
+
+    @functools.cached_property
+    def pixel_values(self):
+        """
+        Pixel values in the ROI for each image, gathered on first access.
+
+        Returns
+        -------
+        Array (n_images, n_pixels) of pixel values in ROI.
+        """
+        pixel_arrays = self._pixel_arrays
+        if pixel_arrays is None:
+            pixel_arrays = [pixel_rescale(img) for img in self.dcm_images]
+        return np.array([px[self.ROI_rows, self.ROI_cols] for px in pixel_arrays])
 
     def __len__(self):
         """Number of time samples in series."""
-        return len(self.pixel_values)
+        return len(self.times)
 
     @property
     def means(self):
         """
-        List of mean ROI values at different times.
+        Mean ROI values at different times.
 
         Returns
         -------
-        List of mean pixel value in ROI for each sample.
+        Array of mean pixel value in ROI for each sample.
         """
-        return [np.mean(pvs) for pvs in self.pixel_values]
+        return self.pixel_values.mean(axis=1, dtype=np.float64)
 
 
 class ImageStack:
@@ -648,6 +874,26 @@ class ImageStack:
         self.time_attr = time_attribute
         # store sorted images
         self.images = self.order_by(image_slices, time_attribute)
+        # header values shared by every ROI, so only looked up once
+        self.times = [img[time_attribute].value.real for img in self.images]
+        self.trs = [img["RepetitionTime"].value.real for img in self.images]
+        # rescale each image once into a single (n_images, rows, cols) array,
+        # shared by the template fit and every ROI
+        # float32 halves the memory of the stack and holds integer pixel values
+        # exactly, but not non-integer rescaled values (e.g. Philips scaling),
+        # which need float64
+        self.pixel_arrays = None
+        for i, img in enumerate(self.images):
+            px = pixel_rescale(img)
+            is_integer = np.issubdtype(px.dtype, np.integer)
+            if self.pixel_arrays is None:
+                self.pixel_arrays = np.empty(
+                    (len(self.images), *px.shape),
+                    dtype=np.float32 if is_integer else np.float64,
+                )
+            elif not is_integer:
+                self.pixel_arrays = self.pixel_arrays.astype(np.float64, copy=False)
+            self.pixel_arrays[i] = px
 
         b0_val = self.images[0]["MagneticFieldStrength"].value
         if b0_val not in [1.5, 3.0]:
@@ -665,10 +911,11 @@ class ImageStack:
 
     def order_by(self, images, att):
         """Order images by attribute (e.g. EchoTime, InversionTime)."""
-        sorted_images = sorted(images, key=lambda x: x[att].value.real)
-        return sorted_images
+        # look the attribute up once per image, then sort the keys
+        keys = np.array([img[att].value.real for img in images])
+        return [images[i] for i in np.argsort(keys, kind="stable")]
 
-    def template_fit(self, template_dcm, image_index=0):
+    def template_fit(self, template_dcm, image_index=0, warp_matrix_seed=None):
         """
         Calculate transformation matrix to fit template to image.
 
@@ -688,6 +935,12 @@ class ImageStack:
         ----------
         image_index : int, optional
             Index of image to be used for template matching. The default is 0.
+        warp_matrix_seed : np.array, optional
+            RT transform matrix (2,3) to start the fit from, e.g. the result of
+            fitting the same template to a T1 stack from the same session
+            before fitting its T2 stack. ECC then only needs a few iterations.
+            The default is None, which starts from the template to image
+            scaling.
 
         Returns
         -------
@@ -712,30 +965,18 @@ class ImageStack:
         Despite these limitations, this method works well in practice for small
         angle rotations.
         """
-        # Store template pixel array, after scaling in 0028,1052 and
-        # 0028,1053 applied
-        template_px = pixel_rescale(template_dcm)
-        target_px = pixel_rescale(self.images[0])
-
-        ## Pad template or target pixels if required
-        # Determine difference in shape
-        pad_size = np.subtract(template_px.shape, target_px.shape)
-        assert pad_size[0] == pad_size[1], "Image matrices must be square."
-        if pad_size[0] > 0:  # pad target--UNTESTED
+        target_px = self.pixel_arrays[0]
+        # Template pixel array (padded if smaller than the target) and its
+        # 8-bit version. These only depend on the template file, so are cached
+        template_px, self.template8bit = template_8bit(template_dcm, target_px.shape)
+
+        pad_size = len(template_px) - len(target_px)
+        if pad_size > 0:  # pad target--UNTESTED
             # add pixels to target if smaller than template
-            target_px = np.pad(target_px, pad_width=(0, pad_size[0]))
-        elif pad_size[0] < 0:  # pad template
-            # add pixels to template if smaller than target
-            template_px = np.pad(template_px, pad_width=(0, -pad_size[0]))
+            target_px = np.pad(target_px, pad_width=(0, pad_size))
 
         # Always fit on magnitude images for simplicity. May be suboptimal
-        self.template8bit = cv.normalize(
-            abs(template_px), None, 0, 255, norm_type=cv.NORM_MINMAX, dtype=cv.CV_8U
-        )
-
-        self.target8bit = cv.normalize(
-            abs(target_px), None, 0, 255, norm_type=cv.NORM_MINMAX, dtype=cv.CV_8U
-        )
+        self.target8bit = magnitude_8bit(target_px)
 
         # initialise transformation fitting parameters.
         scale_factor = len(target_px) / len(template_px)
@@ -747,15 +988,25 @@ class ImageStack:
             (self.template8bit.shape[1], self.template8bit.shape[0]),
         )
 
+        if warp_matrix_seed is None:
+            initial_warp = scale_matrix
+        else:
+            # copy, as OpenCV may update the initial matrix in place
+            initial_warp = np.array(warp_matrix_seed, dtype=np.float32)
+
         # Apply transformation
         criteria = (
             cv.TERM_CRITERIA_EPS | cv.TERM_CRITERIA_COUNT,
             TEMPLATE_FIT_ITERS,
             TERMINATION_EPS,
         )
-        # Find the geometric transform (warp) between two images in terms of the ECC criterion
+        # Find the geometric transform (warp) between two images in terms of the ECC criterion.
+        # ECC works in float32, so convert once here rather than inside OpenCV
         self.template_cc, warp_matrix = cv.findTransformECC(
-            self.template8bit, self.target8bit, scale_matrix, criteria=criteria
+            self.template8bit.astype(np.float32),
+            self.target8bit.astype(np.float32),
+            initial_warp,
+            criteria=criteria,
         )
 
         self.warped_template8bit = cv.warpAffine(
@@ -795,9 +1046,37 @@ class ImageStack:
         self.ROI_time_series = []
         for i in range(num_coords):
             self.ROI_time_series.append(
-                ROITimeSeries(self.images, adjusted_coords_row_col[i], self.time_attr)
+                ROITimeSeries(
+                    self.images,
+                    adjusted_coords_row_col[i],
+                    self.time_attr,
+                    pixel_arrays=self.pixel_arrays,
+                    times=self.times,
+                    trs=self.trs,
+                )
             )
 
+        # Gather every ROI from every image in one go and share it with the
+        # ROITimeSeries objects as (n_images, n_pixels) views
+        self.ROI_pixel_values = self.gather_roi_pixel_values()
+        for i, roi in enumerate(self.ROI_time_series):
+            roi.pixel_values = self.ROI_pixel_values[:, i]
+        self.ROI_means = self.ROI_pixel_values.mean(axis=-1, dtype=np.float64)
+
+    def gather_roi_pixel_values(self):
+        """
+        Pixel values of every ROI in every image with a single fancy index.
+
+        Returns
+        -------
+        np.array
+            Array (n_images, n_rois, n_pixels) of ROI pixel values. Averaging
+            over the last axis gives the ROI means, ``self.ROI_means``.
+        """
+        rows = np.array([roi.ROI_rows for roi in self.ROI_time_series])
+        cols = np.array([roi.ROI_cols for roi in self.ROI_time_series])
+        return self.pixel_arrays[:, rows, cols]
+
     def plot_fit(self):
         """
         Visual representation of target fitting.
@@ -819,12 +1098,18 @@ class ImageStack:
         plt.title("Image")
 
         plt.subplot(2, 2, 3)
-        plt.imshow(self.scaled_template8bit / 2 + self.target8bit / 2, cmap="gray")
+        plt.imshow(
+            cv.addWeighted(self.scaled_template8bit, 0.5, self.target8bit, 0.5, 0),
+            cmap="gray",
+        )
         plt.title("Image / template overlay")
         plt.axis("off")
 
         plt.subplot(2, 2, 4)
-        plt.imshow(self.warped_template8bit / 2 + self.target8bit / 2, cmap="gray")
+        plt.imshow(
+            cv.addWeighted(self.warped_template8bit, 0.5, self.target8bit, 0.5, 0),
+            cmap="gray",
+        )
         plt.title("Image / fitted template overlay")
         plt.axis("off")
 
@@ -856,12 +1141,16 @@ class ImageStack:
         plt.imshow(self.target8bit, cmap="gray")
         plt.axis("off")
         if hasattr(self, "ROI_time_series"):
-            combined_ROI_map = np.zeros_like(self.ROI_time_series[0].ROI_mask)
+            # mark every ROI pixel in one array, rather than summing a full
+            # image mask per ROI
+            combined_ROI_map = np.zeros(
+                self.ROI_time_series[0].image_shape, dtype=np.int8
+            )
             for roi in self.ROI_time_series:
-                combined_ROI_map += roi.ROI_mask
+                np.add.at(combined_ROI_map, (roi.ROI_rows, roi.ROI_cols), 1)
             lines = outline_mask(combined_ROI_map)
-            for line in lines:
-                plt.plot(line[1], line[0], color="r", alpha=1)
+            # one plot call, each column of x and y is a line segment
+            plt.plot(lines[:, 2:].T, lines[:, :2].T, color="r", alpha=1)
 
         return fig
 
@@ -1027,8 +1316,8 @@ class T1ImageStack(ImageStack):
         """
         self.t1_est = t1_estimates
         rois = self.ROI_time_series
-        rois_first_mean = np.array([roi.means[0] for roi in rois])
-        rois_last_mean = np.array([roi.means[-1] for roi in rois])
+        rois_first_mean = self.ROI_means[0]
+        rois_last_mean = self.ROI_means[-1]
         s0_est_last = abs(
             self.est_t1_s0(
                 rois[0].times[-1], rois[0].trs[-1], self.t1_est, rois_last_mean
@@ -1064,7 +1353,7 @@ class T1ImageStack(ImageStack):
             scipy.optimize.curve_fit(
                 self.fit_function,
                 rois[i].times,
-                rois[i].means,
+                self.ROI_means[:, i],
                 p0=[t1_estimates[i], s0_est[i], self.a1_est[i]],
                 jac=self.fit_jacobian,
                 method="lm",
@@ -1183,7 +1472,7 @@ class T2ImageStack(ImageStack):
         """
         self.t2_est = t2_estimates
         rois = self.ROI_time_series
-        rois_second_mean = np.array([roi.means[1] for roi in rois])
+        rois_second_mean = self.ROI_means[1]
         self.c_est = np.full_like(self.t2_est, SEED_RICIAN_NOISE)
         # estimate s0 from second image--first image is too low.
         s0_est = self.est_t2_s0(
@@ -1239,7 +1528,7 @@ class T2ImageStack(ImageStack):
             scipy.optimize.curve_fit(
                 self.fit_function,
                 rois[i].times[1:],
-                rois[i].means[1:],
+                self.ROI_means[1:, i],
                 p0=[t2_estimates[i], s0_est[i], self.c_est[i]],
                 jac=None,
                 bounds=bounds,
@@ -6,19 +6,99 @@ Square voxels, no multi-frame support
 import os
 import sys
 import traceback
-from copy import copy, deepcopy
+from collections import OrderedDict
+from copy import deepcopy
 from math import pi
 
 import numpy as np
 import scipy.optimize as opt
 from matplotlib import pyplot as plt
 from scipy import ndimage
-from scipy.interpolate import interp1d
 from skimage.measure import regionprops
+from skimage.morphology import max_tree
 
 from hazenlib.HazenTask import HazenTask
+from hazenlib.exceptions import ShapeDetectionError
 from hazenlib.utils import Rod
 
+# steps tried by SliceWidth.fit_trapezoid, one per row, for the baseline
+# polynomial coefficients, the trapezoid widths (ramp, plateau, left and right
+# baselines) and the plateau amplitude
+BASELINE_STEPS = np.array(
+    [[-0.0001, 0, 0], [0.0001, 0, 0], [0, -0.001, 0], [0, 0.001, 0]]
+    + [[0, 0, -0.1], [0, 0, 0.1]]
+    + [[0, 0, 0]] * 8
+)
+TRAPEZOID_WIDTH_STEPS = np.array(
+    [[0, 0, 0, 0]] * 6
+    + [[-1, 0, 1, 1], [1, 0, -1, -1]]  # decrease / increase the ramp width
+    + [[0, -2, 1, 1], [0, 2, -1, -1]]  # decrease / increase the plateau width
+    + [[0, 0, -1, 1], [0, 0, 1, -1]]  # shift the centre left / right
+    + [[0, 0, 0, 0]] * 2
+)
+AMPLITUDE_STEPS = np.array([0] * 12 + [-0.1, 0.1])
+
+# rods found by get_rods, keyed by SOPInstanceUID and a pixel data
+# hash, least recently used first
+ROD_CACHE_SIZE = 32
+_rod_cache = OrderedDict()
+
+# flattened row/column index grids, keyed by image shape
+_index_grid_cache = {}
+
+
+def rod_points(rods):
+    """Rod coordinates as an array
+
+    Args:
+        rods (list of Rods or np.array): rods, or their (x, y) coordinates
+
+    Returns:
+        np.array: x, y coordinates, one row per rod
+    """
+    if isinstance(rods, np.ndarray):
+        return rods
+    return np.array([(rod.x, rod.y) for rod in rods], dtype=np.float64)
+
+
+def index_grids(shape):
+    """Flattened row and column index grids for an image shape, cached
+
+    Args:
+        shape (tuple): image shape (rows, columns)
+
+    Returns:
+        tuple: row indices and column indices of every pixel, raveled
+    """
+    if shape not in _index_grid_cache:
+        rows, cols = np.indices(shape, dtype=np.float64)
+        _index_grid_cache[shape] = rows.ravel(), cols.ravel()
+    return _index_grid_cache[shape]
+
+
+def centres_of_mass(arr, labeled_array, num_labels):
+    """Intensity weighted centre of mass of each labelled region
+
+    Equivalent to ndimage.center_of_mass(arr, labeled_array, range(1, num_labels + 1))
+    but uses weighted bincounts over cached index grids.
+
+    Args:
+        arr (np.array): pixel array
+        labeled_array (np.array): labels of the regions in arr
+        num_labels (int): number of labels
+
+    Returns:
+        np.array: (row, column) centre of mass of labels 1 to num_labels
+    """
+    rows, cols = index_grids(arr.shape)
+    labels = labeled_array.ravel()
+    weights = arr.ravel().astype(np.float64)
+    size = num_labels + 1
+    total = np.bincount(labels, weights=weights, minlength=size)
+    row_sum = np.bincount(labels, weights=weights * rows, minlength=size)
+    col_sum = np.bincount(labels, weights=weights * cols, minlength=size)
+    return np.column_stack((row_sum, col_sum))[1:] / total[1:, None]
+
 
 class SliceWidth(HazenTask):
     """Slice width measurement class for DICOM images of the MagNet phantom
@@ -57,18 +137,48 @@ class SliceWidth(HazenTask):
         """Separate matrix of rods into sorted per row
 
         Args:
-            rods (_type_): _description_
+            rods (list of Rods): rods with x,y coordinates
+
+        Returns:
+            list of Rods: rods ordered lower row first, each row left to right
+        """
+        x = np.array([rod.x for rod in rods])
+        y = np.array([rod.y for rod in rods])
+
+        # split into rows by y (lower row first), then order each row by x
+        rows = np.argsort(y, kind="stable").reshape(3, 3)[::-1]
+        order = np.take_along_axis(rows, np.argsort(x[rows], axis=1, kind="stable"), 1)
+        return [rods[idx] for idx in order.ravel()]
+
+    def get_cached_rods(self, dcm):
+        """Locate rods in a DICOM image, reusing earlier results for the same image
+
+        Rods are cached by SOPInstanceUID and a hash of the pixel data,
+        as anonymised or re-exported images may reuse UIDs. Images without a
+        UID, and runs that save a report (which includes the rod figure),
+        always call get_rods.
+
+        Args:
+            dcm (pydicom.Dataset): DICOM image object
 
         Returns:
-            _type_: _description_
+            tuple: rods and rods_initial, as returned by get_rods
         """
-        lower_row = sorted(rods, key=lambda rod: rod.y)[-3:]
-        lower_row = sorted(lower_row, key=lambda rod: rod.x)
-        middle_row = sorted(rods, key=lambda rod: rod.y)[3:6]
-        middle_row = sorted(middle_row, key=lambda rod: rod.x)
-        upper_row = sorted(rods, key=lambda rod: rod.y)[0:3]
-        upper_row = sorted(upper_row, key=lambda rod: rod.x)
-        return lower_row + middle_row + upper_row
+        uid = getattr(dcm, "SOPInstanceUID", None)
+        if uid is None or self.report:
+            return self.get_rods(dcm.pixel_array)
+
+        arr = dcm.pixel_array
+        key = (uid, arr.shape, arr.dtype.str, hash(arr.tobytes()))
+        if key in _rod_cache:
+            _rod_cache.move_to_end(key)
+        else:
+            _rod_cache[key] = self.get_rods(arr)
+            if len(_rod_cache) > ROD_CACHE_SIZE:
+                _rod_cache.popitem(last=False)
+
+        # copy, as callers may move the rods
+        return deepcopy(_rod_cache[key])
 
     def get_rods(self, arr):
         """Locate rods in the pixel array
@@ -90,44 +200,59 @@ class SliceWidth(HazenTask):
         # inverted image for fitting (maximisation)
         arr_inv = np.invert(arr)
         if np.min(arr_inv) < 0:
-            arr_inv = arr_inv + abs(
-                np.min(arr_inv)
+            # widen first, the shifted values can overflow a signed dtype
+            arr_inv = arr_inv.astype(np.int64) + abs(
+                int(np.min(arr_inv))
             )  # ensure voxel values positive for maximisation
 
         """ Initial Center-of-mass Rod Locator """
 
         # threshold and binaries the image in order to locate the rods.
         img_max = np.max(arr)  # maximum number of img intensity
-        no_region = [None] * img_max
 
         img_tmp = arr
-        # step over a range of threshold levels from 0 to the max in the image
-        # using the ndimage.label function to count the features for each threshold
-        for x in range(0, img_max):
-            tmp = img_tmp <= x
-            labeled_array, num_features = ndimage.label(tmp.astype(int))
-            no_region[x] = num_features
+        # count the features for each threshold level from 0 to the max in the
+        # image. The counts are not monotonic in the threshold, so rather than
+        # labelling the image at every level, build the component tree of the
+        # image once: each node is a region from the level it first appears
+        # until the level it merges into its parent.
+        # Levels are offset so that negative pixel values, which are below
+        # every threshold, can be counted with bincount too.
+        # The tree is built on the widened levels, as img_max - img_tmp can
+        # overflow the input dtype for signed images.
+        offset = min(int(np.min(img_tmp)), 0)
+        flat = img_tmp.ravel().astype(np.int64) - offset
+        n_levels = img_max - offset + 1
+        parent, _ = max_tree(
+            (flat.max() - flat).reshape(img_tmp.shape), connectivity=1
+        )
+        parent = parent.ravel()
+        is_root = parent == np.arange(flat.size)
+        is_node = (flat[parent] != flat) | is_root
+        appears = np.bincount(flat[is_node], minlength=n_levels)
+        merges = np.bincount(flat[parent[is_node & ~is_root]], minlength=n_levels)
+        no_region = np.cumsum(appears - merges)[-offset : img_max - offset]
 
         # find the indices that correspond to 10 regions and pick the median
-        index = [i for i, val in enumerate(no_region) if val == 10]
+        index = np.flatnonzero(no_region == 10)
+        if index.size == 0:
+            raise ShapeDetectionError("rods", "Did not find the 9 rods")
 
-        thres_ind = np.median(index).astype(int)
+        thres_ind = int(np.median(index))
 
         # Generate the labelled array with the threshold chosen
         img_threshold = img_tmp <= thres_ind
 
-        labeled_array, num_features = ndimage.label(img_threshold.astype(int))
+        labeled_array, num_features = ndimage.label(img_threshold)
 
         # check that we have got the 10 rods!
         if num_features != 10:
-            sys.exit("Did not find the 9 rods")
+            raise ShapeDetectionError("rods", "Did not find the 9 rods")
 
         # list of tuples of x,y coordinates for the centres
-        rod_centres = ndimage.center_of_mass(arr, labeled_array, range(2, 11))
+        rod_centres = centres_of_mass(arr, labeled_array, num_features)[1:]
 
-        rods = [Rod(x=x[1], y=x[0]) for x in rod_centres]
-        rods = self.sort_rods(rods)
-        rods_initial = deepcopy(rods)  # save for later
+        rods_initial = self.sort_rods([Rod(x=x[1], y=x[0]) for x in rod_centres])
 
         """ Gaussian 2D Rod Locator """
 
@@ -177,11 +302,9 @@ class SliceWidth(HazenTask):
                 bbox["x_start"][idx],
                 bbox["y_start"][idx],
             )
-            # note: flipped x/y
-            rods[idx].x = y0_im[idx]
-            rods[idx].y = x0_im[idx]
 
-        rods = self.sort_rods(rods)
+        # note: flipped x/y. The fits are in label order, so sort them once
+        rods = self.sort_rods([Rod(x=x, y=y) for x, y in zip(y0_im, x0_im)])
 
         # save figure
         if self.report:
@@ -248,8 +371,8 @@ class SliceWidth(HazenTask):
 
         Parameters
         ----------
-        rods : array_like
-            rod positions in pixels
+        rods : list of Rods or array_like
+            rod positions in pixels, or their (x, y) coordinates
 
         Returns
         -------
@@ -258,29 +381,11 @@ class SliceWidth(HazenTask):
 
         """
         # TODO: move to be a function of the Rod class
-        horz_dist = [
-            np.sqrt(
-                np.square((rods[2].y - rods[0].y)) + np.square(rods[2].x - rods[0].x)
-            ),
-            np.sqrt(
-                np.square((rods[5].y - rods[3].y)) + np.square(rods[5].x - rods[3].x)
-            ),
-            np.sqrt(
-                np.square((rods[8].y - rods[6].y)) + np.square(rods[8].x - rods[6].x)
-            ),
-        ]
+        points = rod_points(rods)
 
-        vert_dist = [
-            np.sqrt(
-                np.square((rods[0].y - rods[6].y)) + np.square(rods[0].x - rods[6].x)
-            ),
-            np.sqrt(
-                np.square((rods[1].y - rods[7].y)) + np.square(rods[1].x - rods[7].x)
-            ),
-            np.sqrt(
-                np.square((rods[2].y - rods[8].y)) + np.square(rods[2].x - rods[8].x)
-            ),
-        ]
+        # rows left to right: 1-3, 4-6, 7-9; columns top to bottom: 1-7, 2-8, 3-9
+        horz_dist = np.linalg.norm(points[[2, 5, 8]] - points[[0, 3, 6]], axis=1)
+        vert_dist = np.linalg.norm(points[[0, 1, 2]] - points[[6, 7, 8]], axis=1)
 
         return horz_dist, vert_dist
 
@@ -320,17 +425,13 @@ class SliceWidth(HazenTask):
         """
         # TODO: move to be a function of the Rod class
 
-        # calculate the horizontal and vertical distances
-        horz_dist_mm = np.multiply(self.pixel_size, horz_dist)
-        vert_dist_mm = np.multiply(self.pixel_size, vert_dist)
-
-        horz_distortion = (
-            100 * np.std(horz_dist_mm, ddof=1) / np.mean(horz_dist_mm)
-        )  # ddof to match MATLAB std
-        horz_distortion = (
-            100 * np.std(horz_dist_mm, ddof=1) / np.mean(horz_dist_mm)
-        )  # ddof to match MATLAB std
-        vert_distortion = 100 * np.std(vert_dist_mm, ddof=1) / np.mean(vert_dist_mm)
+        # calculate the horizontal and vertical distances, one row each
+        dist_mm = np.multiply(self.pixel_size, [horz_dist, vert_dist])
+
+        # ddof to match MATLAB std
+        horz_distortion, vert_distortion = (
+            100 * np.std(dist_mm, axis=1, ddof=1) / np.mean(dist_mm, axis=1)
+        )
         return horz_distortion, vert_distortion
 
     def baseline_correction(self, profile, sample_spacing):
@@ -342,7 +443,7 @@ class SliceWidth(HazenTask):
 
         Returns:
             dict: of polynomial_coefficients, x_interpolated,
-                baseline/polynomial_fit, baseline, baseline_interpolated,
+                x_interpolated_powers, baseline, baseline_interpolated,
                 profile_interpolated, profile_corrected_interpolated
 
         """
@@ -356,34 +457,31 @@ class SliceWidth(HazenTask):
 
         # seconds order poly fit of the outer profile
         polynomial_coefficients = np.polyfit(x_outer, outer_profile, 2)
-        polynomial_fit = np.poly1d(polynomial_coefficients)
 
         # use the poly fit to generate a quadratic curve with 0.25 space (high res)
         x_interp = np.arange(0, profile_width, sample_spacing)
         x = np.arange(0, profile_width)
+        # columns x^2, x, 1: polynomial values are x_interp_powers @ coefficients
+        x_interp_powers = np.vander(x_interp, 3)
 
-        baseline_interp = polynomial_fit(x_interp)
-        baseline = polynomial_fit(x)
+        baseline_interp = x_interp_powers @ polynomial_coefficients
+        baseline = np.polyval(polynomial_coefficients, x)
 
         # Remove the baseline effects from the profiles
         profile_corrected = profile - baseline
-        f = interp1d(x, profile_corrected, fill_value="extrapolate")
-        profile_corrected_interp = f(x_interp)
+        profile_corrected_interp = np.interp(x_interp, x, profile_corrected)
+        # np.interp holds the last value, so extrapolate the final segment
+        # for the samples beyond the last pixel
+        beyond = x_interp > x[-1]
+        profile_corrected_interp[beyond] = profile_corrected[-2] + (
+            profile_corrected[-1] - profile_corrected[-2]
+        ) * (x_interp[beyond] - x[-2])
         profile_interp = profile_corrected_interp + baseline_interp
 
         return {
             "f": polynomial_coefficients,
             "x_interpolated": x_interp,
-            "baseline_fit": polynomial_fit,
-            "baseline": baseline,
-            "baseline_interpolated": baseline_interp,
-            "profile_interpolated": profile_interp,
-            "profile_corrected_interpolated": profile_corrected_interp,
-        }
-        return {
-            "f": polynomial_coefficients,
-            "x_interpolated": x_interp,
-            "baseline_fit": polynomial_fit,
+            "x_interpolated_powers": x_interp_powers,
             "baseline": baseline,
             "baseline_interpolated": baseline_interp,
             "profile_interpolated": profile_interp,
@@ -536,7 +634,13 @@ class SliceWidth(HazenTask):
         return x0_im, y0_im, x0, y0
 
     def trapezoid(
-        self, n_ramp, n_plateau, n_left_baseline, n_right_baseline, plateau_amplitude
+        self,
+        n_ramp,
+        n_plateau,
+        n_left_baseline,
+        n_right_baseline,
+        plateau_amplitude,
+        out=None,
     ):
         """
 
@@ -546,42 +650,33 @@ class SliceWidth(HazenTask):
             n_left_baseline
             n_right_baseline
             plateau_amplitude
+            out (np.array, optional): array to write the trapezoid into, reused
+                if it has the trapezoid's length
 
         Returns:
             tuple: trapezoid and fwmh
         """
+        # segments with fewer than one sample are left out
+        n_ramp, n_plateau, n_left_baseline, n_right_baseline = (
+            max(n, 0) for n in (n_ramp, n_plateau, n_left_baseline, n_right_baseline)
+        )
+        n_total = n_left_baseline + 2 * n_ramp + n_plateau + n_right_baseline
+        if out is None or len(out) != n_total:
+            out = np.empty(n_total)
+
+        plateau_start = n_left_baseline + n_ramp
+        plateau_end = plateau_start + n_plateau
+        out[:n_left_baseline] = 0
+        out[n_left_baseline:plateau_start] = np.linspace(0, plateau_amplitude, n_ramp)
+        out[plateau_start:plateau_end] = plateau_amplitude
+        out[plateau_end : plateau_end + n_ramp] = np.linspace(
+            plateau_amplitude, 0, n_ramp
+        )
+        out[plateau_end + n_ramp :] = 0
 
-        if n_left_baseline < 1:
-            left_baseline = []
-        else:
-            left_baseline = np.zeros(n_left_baseline)
-
-        if n_ramp < 1:
-            left_ramp = []
-            right_ramp = []
-        else:
-            left_ramp = np.linspace(0, plateau_amplitude, n_ramp)
-            right_ramp = np.linspace(plateau_amplitude, 0, n_ramp)
-
-        if n_plateau < 1:
-            plateau = []
-        else:
-            plateau = plateau_amplitude * np.ones(n_plateau)
-
-        if n_right_baseline < 1:
-            right_baseline = []
-        else:
-            right_baseline = np.zeros(n_right_baseline)
+        fwhm = n_plateau + n_ramp
 
-            trap = np.concatenate(
-                [left_baseline, left_ramp, plateau, right_ramp, right_baseline]
-            )
-            trap = np.concatenate(
-                [left_baseline, left_ramp, plateau, right_ramp, right_baseline]
-            )
-            fwhm = n_plateau + n_ramp
-
-        return trap, fwhm
+        return out, fwhm
 
     def get_ramp_profiles(self, image_array, rods) -> dict:
         """Find the central y-axis point for the top and bottom profiles
@@ -589,43 +684,37 @@ class SliceWidth(HazenTask):
 
         Args:
             image_array (dcm.pixelarray): pixel array from a DICOM image
-            rods (list of Rods): list of rods with x,y coordinates
+            rods (list of Rods or np.array): rods, or their (x, y) coordinates
 
         Returns:
-            dict: top and bottom ramp profiles
+            dict: top and bottom ramp profiles, their means across rows and
+                their vertical centres
         """
+        x, y = rod_points(rods).T
 
-        top_profile_vertical_centre = np.round(
-            ((rods[3].y - rods[6].y) / 2) + rods[6].y
-        ).astype(int)
-        bottom_profile_vertical_centre = np.round(
-            ((rods[0].y - rods[3].y) / 2) + rods[3].y
-        ).astype(int)
-        top_profile_vertical_centre = np.round(
-            ((rods[3].y - rods[6].y) / 2) + rods[6].y
-        ).astype(int)
-        bottom_profile_vertical_centre = np.round(
-            ((rods[0].y - rods[3].y) / 2) + rods[3].y
-        ).astype(int)
+        top_profile_vertical_centre = int(np.round(((y[3] - y[6]) / 2) + y[6]))
+        bottom_profile_vertical_centre = int(np.round(((y[0] - y[3]) / 2) + y[3]))
 
         # Selected 20mm around the mid-distances and take the average to find the line profiles
         top_profile = image_array[
             (top_profile_vertical_centre - round(10 / self.pixel_size)) : (
                 top_profile_vertical_centre + round(10 / self.pixel_size)
             ),
-            int(rods[3].x) : int(rods[5].x),
+            int(x[3]) : int(x[5]),
         ]
 
         bottom_profile = image_array[
             (bottom_profile_vertical_centre - round(10 / self.pixel_size)) : (
                 bottom_profile_vertical_centre + round(10 / self.pixel_size)
             ),
-            int(rods[3].x) : int(rods[5].x),
+            int(x[3]) : int(x[5]),
         ]
 
         return {
             "top": top_profile,
             "bottom": bottom_profile,
+            "top-mean": top_profile.mean(axis=0, dtype=np.float64),
+            "bottom-mean": bottom_profile.mean(axis=0, dtype=np.float64),
             "top-centre": top_profile_vertical_centre,
             "bottom-centre": bottom_profile_vertical_centre,
         }
@@ -693,36 +782,37 @@ class SliceWidth(HazenTask):
             profiles["profile_corrected_interpolated"], slice_thickness
         )
 
-        x_interp = profiles["x_interpolated"]
         profile_interp = profiles["profile_interpolated"]
-        baseline_interpolated = profiles["baseline_fit"](x_interp)
-        baseline_fit_coefficients = profiles["baseline_fit"]
-        baseline_fit_coefficients = [
-            baseline_fit_coefficients.c[0],
-            baseline_fit_coefficients.c[1],
-            baseline_fit_coefficients.c[2],
-        ]
+        baseline_interpolated = profiles["baseline_interpolated"]
+        baseline_fit_coefficients = list(profiles["f"])
         # sum squared differences
-        current_error = sum(
-            (
-                profiles["profile_corrected_interpolated"]
-                - (baseline_interpolated + trapezoid_fit)
-            )
-            ** 2
+        residual = profiles["profile_corrected_interpolated"] - (
+            baseline_interpolated + trapezoid_fit
         )
+        current_error = np.dot(residual, residual)
+
+        # reused by every get_error call for the trapezoid and for the
+        # baseline, the fit and the residual
+        trapezoid_buffer = np.empty_like(trapezoid_fit, dtype=np.float64)
+        work = np.empty_like(profile_interp, dtype=np.float64)
+        x_interp_powers = profiles["x_interpolated_powers"]
 
         def get_error(base, trap):
             """Check if fit is improving"""
-            trapezoid_fit_temp, _ = self.trapezoid(*trap)
+            trapezoid_fit_temp, _ = self.trapezoid(*trap, out=trapezoid_buffer)
 
-            baseline_fit_temp = np.poly1d(base)(x_interp)
+            np.dot(x_interp_powers, base, out=work)
 
-            sum_squared_difference = sum(
-                (profile_interp - (baseline_fit_temp + trapezoid_fit_temp)) ** 2
-            )
+            np.add(work, trapezoid_fit_temp, out=work)
+            np.subtract(profile_interp, work, out=work)
+            sum_squared_difference = np.dot(work, work)
 
             return sum_squared_difference
 
+        baseline = np.array(baseline_fit_coefficients)
+        widths = np.array(trapezoid_fit_coefficients[:4])
+        amplitude = trapezoid_fit_coefficients[4]
+
         cont = 1
         j = 0
         # Go through a series of changes to reduce error,
@@ -731,116 +821,30 @@ class SliceWidth(HazenTask):
             j += 1
             cont = 0
 
-            for i in range(14):
-                baseline_fit_coefficients_temp = copy(baseline_fit_coefficients)
-                trapezoid_fit_coefficients_temp = copy(trapezoid_fit_coefficients)
-
-                if i == 0:
-                    baseline_fit_coefficients_temp[0] = (
-                        baseline_fit_coefficients_temp[0] - 0.0001
-                    )
-
-                elif i == 1:
-                    baseline_fit_coefficients_temp[0] = (
-                        baseline_fit_coefficients_temp[0] + 0.0001
-                    )
-                elif i == 2:
-                    baseline_fit_coefficients_temp[1] = (
-                        baseline_fit_coefficients_temp[1] - 0.001
-                    )
-                elif i == 3:
-                    baseline_fit_coefficients_temp[1] = (
-                        baseline_fit_coefficients_temp[1] + 0.001
-                    )
-                elif i == 4:
-                    baseline_fit_coefficients_temp[2] = (
-                        baseline_fit_coefficients_temp[2] - 0.1
-                    )
-                elif i == 5:
-                    baseline_fit_coefficients_temp[2] = (
-                        baseline_fit_coefficients_temp[2] + 0.1
-                    )
-                elif i == 6:  # Decrease the ramp width
-                    trapezoid_fit_coefficients_temp[0] = (
-                        trapezoid_fit_coefficients_temp[0] - 1
-                    )
-                    trapezoid_fit_coefficients_temp[2] = (
-                        trapezoid_fit_coefficients_temp[2] + 1
-                    )
-                    trapezoid_fit_coefficients_temp[3] = (
-                        trapezoid_fit_coefficients_temp[3] + 1
-                    )
-                elif i == 7:  # Increase the ramp width
-                    trapezoid_fit_coefficients_temp[0] = (
-                        trapezoid_fit_coefficients_temp[0] + 1
-                    )
-                    trapezoid_fit_coefficients_temp[2] = (
-                        trapezoid_fit_coefficients_temp[2] - 1
-                    )
-                    trapezoid_fit_coefficients_temp[3] = (
-                        trapezoid_fit_coefficients_temp[3] - 1
-                    )
-                elif i == 8:  # Decrease plateau width
-                    trapezoid_fit_coefficients_temp[1] = (
-                        trapezoid_fit_coefficients_temp[1] - 2
-                    )
-                    trapezoid_fit_coefficients_temp[2] = (
-                        trapezoid_fit_coefficients_temp[2] + 1
-                    )
-                    trapezoid_fit_coefficients_temp[3] = (
-                        trapezoid_fit_coefficients_temp[3] + 1
-                    )
-
-                elif i == 9:  # Increase plateau width
-                    trapezoid_fit_coefficients_temp[1] = (
-                        trapezoid_fit_coefficients_temp[1] + 2
-                    )
-                    trapezoid_fit_coefficients_temp[2] = (
-                        trapezoid_fit_coefficients_temp[2] - 1
-                    )
-                    trapezoid_fit_coefficients_temp[3] = (
-                        trapezoid_fit_coefficients_temp[3] - 1
-                    )
-
-                elif i == 10:  # Shift centre to the left
-                    trapezoid_fit_coefficients_temp[2] = (
-                        trapezoid_fit_coefficients_temp[2] - 1
-                    )
-                    trapezoid_fit_coefficients_temp[3] = (
-                        trapezoid_fit_coefficients_temp[3] + 1
-                    )
-
-                elif i == 11:  # Shift centre to the right
-                    trapezoid_fit_coefficients_temp[2] = (
-                        trapezoid_fit_coefficients_temp[2] + 1
-                    )
-                    trapezoid_fit_coefficients_temp[3] = (
-                        trapezoid_fit_coefficients_temp[3] - 1
-                    )
-
-                elif i == 12:  # Reduce amplitude
-                    trapezoid_fit_coefficients_temp[4] = (
-                        trapezoid_fit_coefficients_temp[4] - 0.1
-                    )
-
-                elif i == 13:  # Increase amplitude
-                    trapezoid_fit_coefficients_temp[4] = (
-                        trapezoid_fit_coefficients_temp[4] + 0.1
-                    )
+            for i, (baseline_step, width_step, amplitude_step) in enumerate(
+                zip(BASELINE_STEPS, TRAPEZOID_WIDTH_STEPS, AMPLITUDE_STEPS)
+            ):
+                baseline_temp = baseline + baseline_step
+                widths_temp = widths + width_step
+                amplitude_temp = amplitude + amplitude_step
 
                 new_error = get_error(
-                    base=baseline_fit_coefficients_temp,
-                    trap=trapezoid_fit_coefficients_temp,
+                    base=baseline_temp, trap=[*widths_temp, amplitude_temp]
                 )
 
                 if new_error < current_error:
                     cont = 1
+                    # note: a narrower ramp (i == 6) lowers current_error
+                    # but the ramp width itself is kept
                     if i > 6:
-                        trapezoid_fit_coefficients = trapezoid_fit_coefficients_temp
+                        widths, amplitude = widths_temp, amplitude_temp
                     else:
-                        baseline_fit_coefficients = baseline_fit_coefficients_temp
+                        baseline = baseline_temp
                     current_error = new_error
 
+        trapezoid_fit_coefficients = [*widths.tolist(), amplitude]
+        baseline_fit_coefficients = baseline.tolist()
+
         return trapezoid_fit_coefficients, baseline_fit_coefficients
 
     def get_slice_width(self, dcm):
@@ -863,8 +867,10 @@ class SliceWidth(HazenTask):
         arr = dcm.pixel_array
         sample_spacing = 0.25
 
-        rods, rods_initial = self.get_rods(arr)
-        horz_distances, vert_distances = self.get_rod_distances(rods)
+        rods, rods_initial = self.get_cached_rods(dcm)
+        # (x, y) coordinates of the rods, for the measurements below
+        points = rod_points(rods)
+        horz_distances, vert_distances = self.get_rod_distances(points)
         horz_distortion_mm, vert_distortion_mm = self.get_rod_distortions(
             horz_distances, vert_distances
         )
@@ -872,13 +878,11 @@ class SliceWidth(HazenTask):
             horizontal_distances=horz_distances
         )
 
-        ramp_profiles = self.get_ramp_profiles(arr, rods)
+        ramp_profiles = self.get_ramp_profiles(arr, points)
         ramp_profiles_baseline_corrected = {
-            "top": self.baseline_correction(
-                np.mean(ramp_profiles["top"], axis=0), sample_spacing
-            ),
+            "top": self.baseline_correction(ramp_profiles["top-mean"], sample_spacing),
             "bottom": self.baseline_correction(
-                np.mean(ramp_profiles["bottom"], axis=0), sample_spacing
+                ramp_profiles["bottom-mean"], sample_spacing
             ),
         }
 
@@ -1028,9 +1032,7 @@ class SliceWidth(HazenTask):
 
             self.plot_rods(axes[0], arr, rods, rods_initial)
 
-            axes[1].plot(
-                np.mean(ramp_profiles["top"], axis=0), label="mean top profile"
-            )
+            axes[1].plot(ramp_profiles["top-mean"], label="mean top profile")
             axes[1].plot(
                 ramp_profiles_baseline_corrected["top"]["baseline"],
                 label="top profile baseline (interpolated)",
@@ -1046,9 +1048,7 @@ class SliceWidth(HazenTask):
             axes[2].plot(top_trap, label="trapezoid fit")
             axes[2].legend()
 
-            axes[3].plot(
-                np.mean(ramp_profiles["bottom"], axis=0), label="mean bottom profile"
-            )
+            axes[3].plot(ramp_profiles["bottom-mean"], label="mean bottom profile")
             axes[3].plot(
                 ramp_profiles_baseline_corrected["bottom"]["baseline"],
                 label="bottom profile baseline (interpolated",
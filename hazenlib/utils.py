@@ -1,4 +1,5 @@
 import os
+import json
 import cv2 as cv
 import pydicom
 import imutils
@@ -6,12 +7,17 @@ import matplotlib
 import numpy as np
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from skimage import filters
 
 import hazenlib.exceptions as exc
 
 matplotlib.use("Agg")
 
+SERIES_INDEX_CACHE = os.path.join(
+    os.path.expanduser("~"), ".cache", "hazen", "series_index.json"
+)
+
 
 def get_dicom_files(folder: str, sort=False) -> list:
     if sort:
@@ -30,6 +36,71 @@ def get_dicom_files(folder: str, sort=False) -> list:
     return file_list
 
 
+def read_series_description(filename: str) -> str:
+    """
+    Read only the SeriesDescription of a DICOM file, skipping the pixel data
+    and every other element in the header.
+
+    :param filename: path to the DICOM file
+    :type filename: str
+    :returns: SeriesDescription of the file
+    """
+    return pydicom.dcmread(
+        filename, stop_before_pixels=True, specific_tags=["SeriesDescription"]
+    ).SeriesDescription
+
+
+def get_series_index(folder: str, files: list = None) -> dict:
+    """
+    Map every DICOM file in a folder to its SeriesDescription.
+
+    The mapping is cached on disk (see SERIES_INDEX_CACHE) against the folder
+    path, the newest file modification time and the file names relative to
+    the folder, so re-running on an unchanged folder does not re-read any
+    headers. Cached entries are returned under the file paths as given, so the
+    folder can be spelled differently (e.g. relative or absolute) between runs.
+
+    :param folder: folder containing the DICOM files
+    :type folder: str
+    :param files: DICOM files in the folder, found with get_dicom_files if not
+        given
+    :type files: list
+    :returns: file path -> SeriesDescription
+    """
+    if files is None:
+        files = get_dicom_files(folder)
+    key = os.path.abspath(folder)
+    mtime = max((os.path.getmtime(f) for f in files), default=0)
+    names = [os.path.relpath(f, folder) for f in files]
+
+    try:
+        with open(SERIES_INDEX_CACHE) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    entry = cache.get(key)
+    if (
+        entry is not None
+        and entry["mtime"] == mtime
+        and set(entry["series"]) == set(names)
+    ):
+        return {f: entry["series"][name] for f, name in zip(files, names)}
+
+    # reading headers is I/O bound so threads give a good speed up
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as ex:
+        descriptions = list(ex.map(read_series_description, files))
+
+    cache[key] = {"mtime": mtime, "series": dict(zip(names, descriptions))}
+    try:
+        os.makedirs(os.path.dirname(SERIES_INDEX_CACHE), exist_ok=True)
+        with open(SERIES_INDEX_CACHE, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass  # the cache is only an optimisation
+    return dict(zip(files, descriptions))
+
+
 def is_dicom_file(filename):
     """
     Util function to check if file is a dicom file
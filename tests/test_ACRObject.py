@@ -3,9 +3,10 @@ import unittest
 import pathlib
 import pydicom
 import numpy as np
+import skimage
 
 from hazenlib import HazenTask
-from hazenlib.ACRObject import ACRObject
+from hazenlib.ACRObject import ACRObject, _convex_hull_mask
 from tests import TEST_DATA_DIR, TEST_REPORT_DIR
 
 
@@ -45,3 +46,33 @@ class TestACRTools(unittest.TestCase):
         )
         rotated_point = np.round(rotated_point, 2)
         assert (rotated_point == self.test_point).all() == True
+
+    def test_circular_mask(self):
+        mask = ACRObject.circular_mask([2, 1], 1, (5, 4))
+        expected = np.zeros((4, 5), dtype=bool)
+        expected[1, 1:4] = True
+        expected[[0, 2], 2] = True
+        np.testing.assert_array_equal(mask, expected)
+
+        # masks are cached and shared, so they must not be writable
+        assert ACRObject.circular_mask((2, 1), 1, [5, 4]) is mask
+        assert not mask.flags.writeable
+
+    def test_convex_hull_mask(self):
+        for image in (self.Siemens_ACR_obj.images[6], self.GE_ACR_obj.images[6]):
+            mask = image > 0.05 * np.max(image)
+            np.testing.assert_array_equal(
+                _convex_hull_mask(mask), skimage.morphology.convex_hull_image(mask)
+            )
+
+        # degenerate hulls: a single pixel, then a few scattered pixels
+        mask = np.zeros((7, 9), dtype=bool)
+        mask[3, 4] = True
+        np.testing.assert_array_equal(
+            _convex_hull_mask(mask), skimage.morphology.convex_hull_image(mask)
+        )
+        mask[[1, 2, 4], [1, 3, 7]] = True
+        np.testing.assert_array_equal(
+            _convex_hull_mask(mask), skimage.morphology.convex_hull_image(mask)
+        )
+        assert not _convex_hull_mask(np.zeros((7, 9), dtype=bool)).any()
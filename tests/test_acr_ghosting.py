@@ -2,9 +2,10 @@ import os
 import unittest
 import pathlib
 import pydicom
+import numpy as np
 
 from hazenlib.utils import get_dicom_files
-from hazenlib.tasks.acr_ghosting import ACRGhosting
+from hazenlib.tasks.acr_ghosting import ACRGhosting, roi_box
 from hazenlib.ACRObject import ACRObject
 from tests import TEST_DATA_DIR, TEST_REPORT_DIR
 
@@ -60,3 +61,35 @@ class TestMedACRGhosting(TestACRGhostingSiemens):
             ,MediumACRPhantom=True
         )
 
+
+class TestROIBox(unittest.TestCase):
+    def test_roi_box_negative_scaling_factor(self):
+        # west ellipse of a phantom close to the left edge of the FoV, for
+        # which the ellipse scaling factor is negative
+        dims = (256, 256)
+        res = 0.977
+        sad = 20
+        w_point = 6
+        w_centre = [128, np.floor(w_point / 2)]
+        left_fov_to_centre = w_centre[1] - sad / 2 - 5
+        w_factor = (sad / 2) / (sad / 2 - abs(left_fov_to_centre))
+        ellipse_radius = 10 / res
+        assert w_factor < 0
+
+        y, x = np.ogrid[: dims[0], : dims[1]]
+        full_mask = np.square((y - w_centre[0]) / (4 * w_factor)) + np.square(
+            (x - w_centre[1]) * w_factor
+        ) <= np.square(ellipse_radius)
+
+        box, y, x = roi_box(
+            w_centre,
+            (4 * w_factor * ellipse_radius, ellipse_radius / w_factor),
+            dims,
+        )
+        box_mask = np.square((y - w_centre[0]) / (4 * w_factor)) + np.square(
+            (x - w_centre[1]) * w_factor
+        ) <= np.square(ellipse_radius)
+
+        assert np.count_nonzero(full_mask) > 0
+        assert np.count_nonzero(box_mask) == np.count_nonzero(full_mask)
+        assert np.array_equal(full_mask[box], box_mask)
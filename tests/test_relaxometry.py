@@ -16,7 +16,11 @@ from hazenlib.tasks.relaxometry import (
     T1ImageStack,
     T2ImageStack,
     Relaxometry,
+    batch_relaxometry,
+    template_8bit,
+    TEMPLATE_CACHE_SIZE,
 )
+from hazenlib.tasks import relaxometry
 from hazenlib.utils import get_dicom_files
 from hazenlib.exceptions import ArgumentCombinationError
 from tests import TEST_DATA_DIR, TEST_REPORT_DIR
@@ -849,6 +853,44 @@ class TestRelaxometry(unittest.TestCase):
             transformed_coordinates_xy, self.TEMPLATE_TARGET_COORDS_COL_ROW, atol=1
         )
 
+    def test_template_8bit_cache_size(self):
+        template_dcm = pydicom.read_file(self.TEMPLATE_PATH_T1_P5)
+        size = template_dcm.Rows
+        shapes = [(size + n, size + n) for n in range(TEMPLATE_CACHE_SIZE + 2)]
+        for shape in shapes:
+            template_px, template8bit = template_8bit(template_dcm, shape)
+            assert template_px.shape == shape
+            assert template8bit.shape == shape
+
+        # only the most recently used templates are kept
+        cached_keys = list(relaxometry._template_8bit_cache)
+        assert len(cached_keys) == TEMPLATE_CACHE_SIZE
+        assert cached_keys[-1] == (template_dcm.filename, shapes[-1])
+        assert (template_dcm.filename, shapes[0]) not in cached_keys
+
+    def test_template_8bit_leaves_template_writeable(self):
+        # without rescaling or padding the template pixels are not copied
+        template_dcm = pydicom.read_file(self.TEMPLATE_PATH_T1_P5)
+        for keyword in ("RescaleSlope", "RescaleIntercept"):
+            if keyword in template_dcm:
+                delattr(template_dcm, keyword)
+        template_dcm.filename = None  # not cached, so always computed
+        shape = (template_dcm.Rows, template_dcm.Columns)
+        template_px, _ = template_8bit(template_dcm, shape)
+        assert not template_px.flags.writeable
+        template_dcm.pixel_array[0, 0] = 0
+
+    def test_template_fit_seed(self):
+        # refitting from a previous fit should give the same warp matrix
+        template_dcm = pydicom.read_file(self.TEMPLATE_PATH_T1_P5)
+        target_dcm = pydicom.read_file(self.TEMPLATE_TARGET_PATH_T1_P5)
+        warp_matrix = T1ImageStack([target_dcm]).template_fit(template_dcm)
+        seeded_warp_matrix = T1ImageStack([target_dcm]).template_fit(
+            template_dcm, warp_matrix_seed=warp_matrix
+        )
+
+        np.testing.assert_allclose(seeded_warp_matrix, warp_matrix, atol=0.01)
+
     def test_image_stack_T1_sort(self):
         # read list of un-ordered T1 files, sort by TI, test sorted
         t1_dcms = [
@@ -1074,6 +1116,22 @@ class TestRelaxometry(unittest.TestCase):
             atol=1,
         )
 
+    def test_batch_relaxometry(self):
+        """Test batch results match running each study on its own."""
+        studies = [
+            get_dicom_files(self.SITE4_T2_P4_DIR),
+            get_dicom_files(self.SITE4_T2_P4_DIR),
+        ]
+        results = batch_relaxometry(studies, "T2", 4, n_jobs=2, verbose=True)
+        task = Relaxometry(input_data=studies[0])
+        expected = task.run(plate_number=4, calc="T2", verbose=True)
+        self.assertEqual(len(results), 2)
+        for result in results:
+            np.testing.assert_allclose(
+                result["additional data"]["calc_times"],
+                expected["additional data"]["calc_times"],
+            )
+
     def test_scale_up_template(self):
         """Test fit for 256x256 GE image with 192x192 template"""
         template_dcm = pydicom.read_file(TEMPLATE_VALUES["plate4"]["t1"]["filename"])
@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 import pathlib
 
 import numpy as np
@@ -6,8 +7,10 @@ import pydicom
 
 # import hazenlib.slice_width as hazen_slice_width
 from tests import TEST_DATA_DIR, TEST_REPORT_DIR
-from hazenlib.tasks.slice_width import SliceWidth
+from hazenlib.tasks.slice_width import SliceWidth, centres_of_mass, rod_points
+from hazenlib.exceptions import ShapeDetectionError
 from hazenlib.utils import get_dicom_files, Rod
+from scipy import ndimage
 import os
 
 
@@ -210,11 +213,97 @@ class TestSliceWidth(unittest.TestCase):
         for n in range(len(rods)):
             np.testing.assert_almost_equal(self.rods[n].centroid, rods[n].centroid, 3)
 
+    def test_get_rods_not_found(self):
+        arr = np.full((64, 64), 100, dtype=np.uint16)
+        with self.assertRaises(ShapeDetectionError):
+            self.slice_width.get_rods(arr)
+
+    def test_get_rods_signed(self):
+        # synthetic signed image: nine rods dipping below zero on a 3x3 grid,
+        # plus a small dark block in the corner as the tenth region
+        y, x = np.mgrid[:120, :120]
+        arr = np.full((120, 120), 1000.0)
+        centres = [(cx, cy) for cy in (90, 60, 30) for cx in (30, 60, 90)]
+        for cx, cy in centres:
+            arr -= 1200 * np.exp(-((x - cx) ** 2 + (y - cy) ** 2) / (2 * 3**2))
+        arr = np.rint(arr).astype(np.int32)
+        arr[:4, :4] = 10
+        assert arr.min() < 0
+
+        rods, rods_initial = self.slice_width.get_rods(arr)
+        np.testing.assert_almost_equal(rod_points(rods), centres, 2)
+        np.testing.assert_almost_equal(rod_points(rods_initial), centres, 2)
+
+    def test_get_rods_signed_wide_range(self):
+        # int16 image spanning more than 32767 levels, so inverting it in its
+        # own dtype would overflow
+        y, x = np.mgrid[:120, :120]
+        arr = np.full((120, 120), 20000.0)
+        centres = [(cx, cy) for cy in (90, 60, 30) for cx in (30, 60, 90)]
+        for cx, cy in centres:
+            arr -= 40000 * np.exp(-((x - cx) ** 2 + (y - cy) ** 2) / (2 * 3**2))
+        arr = np.rint(arr).astype(np.int16)
+        arr[:4, :4] = -20000
+        assert int(arr.max()) - int(arr.min()) > np.iinfo(np.int16).max
+
+        rods, rods_initial = self.slice_width.get_rods(arr)
+        np.testing.assert_almost_equal(rod_points(rods), centres, 2)
+        np.testing.assert_almost_equal(rod_points(rods_initial), centres, 2)
+
+    def test_get_cached_rods(self):
+        dcm = self.slice_width.single_dcm
+        rods, _ = self.slice_width.get_cached_rods(dcm)
+        rods[0].x = -1
+
+        with mock.patch.object(self.slice_width, "get_rods") as get_rods:
+            cached_rods, _ = self.slice_width.get_cached_rods(dcm)
+        get_rods.assert_not_called()
+        for n in range(len(rods)):
+            np.testing.assert_almost_equal(
+                self.rods[n].centroid, cached_rods[n].centroid, 3
+            )
+
+    def test_get_cached_rods_same_uid(self):
+        # a different image reusing the UID (e.g. after anonymisation) must
+        # not get the cached rods back
+        dcm = self.slice_width.single_dcm
+        self.slice_width.get_cached_rods(dcm)
+        other = mock.Mock(
+            SOPInstanceUID=dcm.SOPInstanceUID, pixel_array=np.flipud(dcm.pixel_array)
+        )
+        with mock.patch.object(self.slice_width, "get_rods") as get_rods:
+            self.slice_width.get_cached_rods(other)
+        get_rods.assert_called_once()
+
+        # including a single pixel change
+        arr = dcm.pixel_array.copy()
+        arr[1, 1] += 1
+        other = mock.Mock(SOPInstanceUID=dcm.SOPInstanceUID, pixel_array=arr)
+        with mock.patch.object(self.slice_width, "get_rods") as get_rods:
+            self.slice_width.get_cached_rods(other)
+        get_rods.assert_called_once()
+
+    def test_centres_of_mass(self):
+        arr = self.slice_width.single_dcm.pixel_array
+        labeled_array, num_features = ndimage.label(arr > np.median(arr))
+        expected = ndimage.center_of_mass(
+            arr, labeled_array, range(1, num_features + 1)
+        )
+        np.testing.assert_almost_equal(
+            centres_of_mass(arr, labeled_array, num_features), expected
+        )
+
     def test_get_rod_distances(self):
         # From MATLAB Rods
         distances = self.slice_width.get_rod_distances(self.matlab_rods)
         np.testing.assert_almost_equal(distances, self.DISTANCES, 3)
 
+    def test_get_rod_distances_points(self):
+        points = rod_points(self.matlab_rods)
+        assert points.shape == (9, 2)
+        distances = self.slice_width.get_rod_distances(points)
+        np.testing.assert_almost_equal(distances, self.DISTANCES, 3)
+
     def test_get_rod_distortion_correction_coefficients(self):
         distances = self.slice_width.get_rod_distances(self.matlab_rods)
         # print("rod distortion correction coefficient")
@@ -298,6 +387,15 @@ class TestSliceWidth(unittest.TestCase):
 
         assert self.slice_width.trapezoid(55, 58, 156, 153, -136.6194)[1] == 113
 
+    def test_trapezoid_out(self):
+        trap, _ = self.slice_width.trapezoid(3, 2, 1, 0, -2.0)
+        np.testing.assert_array_equal(trap, [0, 0, -1, -2, -2, -2, -2, -1, 0])
+
+        out = np.full(9, np.nan)
+        trap, _ = self.slice_width.trapezoid(3, 2, 1, 0, -2.0, out=out)
+        assert trap is out
+        np.testing.assert_array_equal(out, [0, 0, -1, -2, -2, -2, -2, -1, 0])
+
     def test_get_initial_trapezoid_fit_and_coefficients(self):
         """
         Notes
@@ -1,5 +1,7 @@
 import unittest
 import os
+import tempfile
+from unittest import mock
 
 import numpy as np
 import pydicom
@@ -102,6 +104,54 @@ class Test_is_Dicom_file(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestSeriesIndex(unittest.TestCase):
+    def setUp(self):
+        self.folder = str(TEST_DATA_DIR / "acr" / "Siemens")
+        self.files = hazen_tools.get_dicom_files(self.folder)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmp_dir.name, "series_index.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_series_index(self):
+        with mock.patch.object(hazen_tools, "SERIES_INDEX_CACHE", self.cache_file):
+            series = hazen_tools.get_series_index(self.folder)
+        assert sorted(series.keys()) == sorted(self.files)
+        for file in self.files[:3]:
+            assert series[file] == pydicom.dcmread(file).SeriesDescription
+
+    def test_series_index_uses_cache(self):
+        with mock.patch.object(hazen_tools, "SERIES_INDEX_CACHE", self.cache_file):
+            series = hazen_tools.get_series_index(self.folder)
+            assert os.path.exists(self.cache_file)
+            with mock.patch.object(
+                hazen_tools, "read_series_description", side_effect=AssertionError
+            ):
+                assert hazen_tools.get_series_index(self.folder) == series
+
+    def test_series_index_cache_other_spelling(self):
+        # a cache written for a relative folder must return paths that exist
+        # when the same folder is later given as an absolute path
+        folder = os.path.relpath(self.folder)
+        with mock.patch.object(hazen_tools, "SERIES_INDEX_CACHE", self.cache_file):
+            hazen_tools.get_series_index(folder)
+            with mock.patch.object(
+                hazen_tools, "read_series_description", side_effect=AssertionError
+            ):
+                series = hazen_tools.get_series_index(os.path.abspath(self.folder))
+        assert sorted(series.keys()) == sorted(
+            hazen_tools.get_dicom_files(os.path.abspath(self.folder))
+        )
+
+    def test_series_index_cache_other_files(self):
+        # a cached folder is re-read if a different set of files is requested
+        with mock.patch.object(hazen_tools, "SERIES_INDEX_CACHE", self.cache_file):
+            hazen_tools.get_series_index(self.folder)
+            series = hazen_tools.get_series_index(self.folder, self.files[:2])
+        assert sorted(series.keys()) == sorted(self.files[:2])
+
+
 class TestUtils(unittest.TestCase):
     def setUp(self):
         TEST_DICOM = str(TEST_DATA_DIR / "toshiba" / "TOSHIBA_TM_MR_DCM_V3_0.dcm")